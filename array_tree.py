@@ -0,0 +1,337 @@
+"""
+Компактне AVL-дерево на масивах (struct-of-arrays)
+
+Замість окремого об'єкта Node на кожен ключ дерево зберігає ключі,
+індекси лівих і правих дітей та висоти в чотирьох суцільних типізованих
+масивах модуля array. Вузол - це просто індекс; -1 означає відсутність
+дитини. Звільнені при видаленні слоти утворюють вбудований список
+вільних слотів (зв'язаний через масив лівих дітей) і перевикористовуються.
+
+На ключ припадає близько 17 байтів (8 + 4 + 4 + 1) проти сотні з гаком
+для об'єкта Node, а дані лежать поруч у пам'яті.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необов'язковий: потрібен лише для to_numpy
+    np = None
+
+_NONE = -1
+
+class ArrayTree:
+    """
+    AVL-дерево на паралельних масивах з тим самим інтерфейсом, що й BinarySearchTree.
+
+    Args:
+        typecode (str): Тип ключів модуля array: 'd' (float) або 'q' (int)
+    """
+
+    def __init__(self, typecode='d'):
+        if typecode not in ('d', 'q'):
+            raise ValueError("Підтримуються лише типи ключів 'd' та 'q'")
+
+        self._keys = array(typecode)
+        self._left = array('i')
+        self._right = array('i')
+        self._height = array('b')
+        self._root = _NONE
+        self._free_head = _NONE
+        self._count = 0
+
+    @classmethod
+    def from_iterable(cls, iterable, typecode='d'):
+        """
+        Створює ідеально збалансоване дерево з довільної послідовності значень.
+
+        Слот кожного ключа збігається з його позицією у відсортованому
+        порядку, тож масив ключів після побудови відсортований.
+        """
+        tree = cls(typecode)
+        keys = sorted(iterable)
+
+        unique = tree._keys
+        for key in keys:
+            if not unique or unique[-1] != key:
+                unique.append(key)
+
+        count = len(unique)
+        tree._left = array('i', [_NONE]) * count
+        tree._right = array('i', [_NONE]) * count
+        tree._height = array('b', [0]) * count
+        tree._count = count
+        if count == 0:
+            return tree
+
+        # Елементи стека: (lo, hi) - напіввідкритий діапазон позицій піддерева
+        tree._root = count // 2
+        stack = [(0, count)]
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            tree._height[mid] = (hi - lo).bit_length()
+            if lo < mid:
+                tree._left[mid] = (lo + mid) // 2
+                stack.append((lo, mid))
+            if mid + 1 < hi:
+                tree._right[mid] = (mid + 1 + hi) // 2
+                stack.append((mid + 1, hi))
+
+        return tree
+
+    def __len__(self):
+        return self._count
+
+    def _h(self, index):
+        """Висота піддерева за індексом (0 для відсутнього)"""
+        return self._height[index] if index != _NONE else 0
+
+    def _allocate(self, key):
+        """Займає слот зі списку вільних або дописує новий у кінець масивів"""
+        index = self._free_head
+        if index != _NONE:
+            self._free_head = self._left[index]
+            self._keys[index] = key
+            self._left[index] = _NONE
+            self._right[index] = _NONE
+            self._height[index] = 1
+        else:
+            index = len(self._keys)
+            self._keys.append(key)
+            self._left.append(_NONE)
+            self._right.append(_NONE)
+            self._height.append(1)
+
+        self._count += 1
+        return index
+
+    def _release(self, index):
+        """
+        Повертає слот у список вільних.
+
+        Ключ обнуляється, тож sum(self._keys) і далі дорівнює сумі живих ключів.
+        """
+        self._keys[index] = 0
+        self._left[index] = self._free_head
+        self._right[index] = _NONE
+        self._height[index] = 0
+        self._free_head = index
+        self._count -= 1
+
+    def insert(self, key):
+        """Вставка нового значення з відновленням балансу"""
+        if self._root == _NONE:
+            self._root = self._allocate(key)
+            return
+
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        index = self._root
+        while index != _NONE:
+            path.append(index)
+            current = keys[index]
+            if key < current:
+                index = left[index]
+            elif key > current:
+                index = right[index]
+            else:
+                return  # Дублікат не вставляємо
+
+        new_index = self._allocate(key)
+        parent = path[-1]
+        if key < keys[parent]:
+            left[parent] = new_index
+        else:
+            right[parent] = new_index
+
+        self._rebalance_path(path)
+
+    def delete(self, key):
+        """
+        Видаляє значення з дерева з відновленням балансу.
+
+        Returns:
+            bool: True, якщо значення було знайдено та видалено
+        """
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        index = self._root
+        while index != _NONE and keys[index] != key:
+            path.append(index)
+            index = left[index] if key < keys[index] else right[index]
+
+        if index == _NONE:
+            return False
+
+        if left[index] != _NONE and right[index] != _NONE:
+            # Слот з двома дітьми: переносимо ключ наступника
+            path.append(index)
+            successor = right[index]
+            while left[successor] != _NONE:
+                path.append(successor)
+                successor = left[successor]
+            keys[index] = keys[successor]
+            index = successor
+
+        child = left[index] if left[index] != _NONE else right[index]
+        self._replace_child(path[-1] if path else _NONE, index, child)
+        self._release(index)
+
+        self._rebalance_path(path)
+        return True
+
+    def _replace_child(self, parent, old, new):
+        """Підміняє дитину old слота parent на new (або корінь)"""
+        if parent == _NONE:
+            self._root = new
+        elif self._left[parent] == old:
+            self._left[parent] = new
+        else:
+            self._right[parent] = new
+
+    def _rebalance_path(self, path):
+        """Оновлює висоти та балансує слоти шляху знизу вгору"""
+        for i in range(len(path) - 1, -1, -1):
+            index = path[i]
+            balanced = self._rebalance(index)
+            if balanced != index:
+                self._replace_child(path[i - 1] if i > 0 else _NONE, index, balanced)
+
+    def _rebalance(self, index):
+        """Відновлює баланс слота та повертає новий корінь піддерева"""
+        left, right = self._left, self._right
+        self._update(index)
+        balance = self._h(left[index]) - self._h(right[index])
+
+        if balance > 1:
+            child = left[index]
+            if self._h(left[child]) < self._h(right[child]):
+                left[index] = self._rotate_left(child)
+            return self._rotate_right(index)
+
+        if balance < -1:
+            child = right[index]
+            if self._h(right[child]) < self._h(left[child]):
+                right[index] = self._rotate_right(child)
+            return self._rotate_left(index)
+
+        return index
+
+    def _update(self, index):
+        """Перераховує висоту слота за висотами дітей"""
+        self._height[index] = 1 + max(self._h(self._left[index]), self._h(self._right[index]))
+
+    def _rotate_left(self, index):
+        """Лівий поворот навколо слота index"""
+        pivot = self._right[index]
+        self._right[index] = self._left[pivot]
+        self._left[pivot] = index
+        self._update(index)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, index):
+        """Правий поворот навколо слота index"""
+        pivot = self._left[index]
+        self._left[index] = self._right[pivot]
+        self._right[pivot] = index
+        self._update(index)
+        self._update(pivot)
+        return pivot
+
+    def find_max(self):
+        """Найбільше значення (найправіший слот) або None, якщо дерево порожнє"""
+        index = self._root
+        if index == _NONE:
+            return None
+        right = self._right
+        while right[index] != _NONE:
+            index = right[index]
+        return self._keys[index]
+
+    def find_min(self):
+        """Найменше значення (найлівіший слот) або None, якщо дерево порожнє"""
+        index = self._root
+        if index == _NONE:
+            return None
+        left = self._left
+        while left[index] != _NONE:
+            index = left[index]
+        return self._keys[index]
+
+    def sum_values(self):
+        """
+        Сума всіх значень одним проходом по суцільному масиву ключів.
+
+        Вільні слоти містять 0, тож обходити структуру дерева не потрібно.
+        """
+        return sum(self._keys)
+
+    def count_nodes(self):
+        """Кількість значень у дереві"""
+        return self._count
+
+    def average_value(self):
+        """Середнє арифметичне значення або 0 для порожнього дерева"""
+        if self._count == 0:
+            return 0
+        return self.sum_values() / self._count
+
+    def height(self):
+        """Висота дерева (0 для порожнього)"""
+        return self._h(self._root)
+
+    def __iter__(self):
+        """Ітерує значення в порядку зростання з явним стеком індексів"""
+        keys, left, right = self._keys, self._left, self._right
+        stack = []
+        index = self._root
+        while stack or index != _NONE:
+            while index != _NONE:
+                stack.append(index)
+                index = left[index]
+            index = stack.pop()
+            yield keys[index]
+            index = right[index]
+
+    def display_inorder(self):
+        """Виводить дерево в порядку зростання (in-order traversal)"""
+        return list(self)
+
+    def to_numpy(self, copy=True):
+        """
+        Повертає живі ключі як масив NumPy (у порядку слотів, не відсортовано).
+
+        Вільні слоти (висота 0) відфільтровуються векторизованою маскою.
+
+        Args:
+            copy (bool): False - якщо вільних слотів немає, повернути
+                представлення масиву ключів без копіювання. Воно лише для
+                читання (зміна на місці зламала б порядок ключів дерева), а
+                поки воно існує, масив не може рости, тож вставка завершиться
+                BufferError; тримайте його лише в межах одного обчислення
+
+        Raises:
+            ImportError: Якщо NumPy не встановлено
+        """
+        if np is None:
+            raise ImportError("Для ArrayTree.to_numpy потрібен NumPy")
+
+        dtype = np.float64 if self._keys.typecode == 'd' else np.int64
+        keys = np.frombuffer(self._keys, dtype=dtype)
+        if self._free_head != _NONE:
+            live = np.frombuffer(self._height, dtype=np.int8) != 0
+            return keys[live]
+        if copy:
+            return keys.copy()
+
+        keys.flags.writeable = False
+        return keys
+
+    def memory_usage(self):
+        """Обсяг пам'яті під буферами масивів у байтах"""
+        return sum(
+            buffer.buffer_info()[1] * buffer.itemsize
+            for buffer in (self._keys, self._left, self._right, self._height)
+        )
@@ -0,0 +1,478 @@
+"""
+Змінні стратегії балансування дерева пошуку
+
+Кожна стратегія - підклас BinarySearchTree, що перевизначає лише хуки
+ядра (_after_insert, _after_remove, _build, search) та, за потреби, клас
+вузла. Тому всі дерева мають спільний інтерфейс insert, delete, find_max,
+find_min, sum_values, display_inorder, select, iter_range тощо, а вибір
+стратегії зводиться до вибору класу:
+
+- AVLTree (модуль bst): найсуворіший баланс, найшвидший пошук
+- RedBlackTree: не більше двох поворотів на вставку - для інтенсивного запису
+- Treap: випадкові пріоритети, очікувана висота O(log n) без перевірок балансу
+- SplayTree: кожен знайдений ключ піднімається в корінь - для перекошеного читання
+- ScapegoatTree: жодних полів у вузлах, лише рідкісні перебудови піддерев
+
+Функція create_tree створює дерево за назвою стратегії.
+"""
+
+import math
+import random
+
+from bst import AVLTree, BinarySearchTree, Node, _size
+
+class _ColorNode(Node):
+    """Вузол червоно-чорного дерева"""
+    __slots__ = ('red',)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.red = True
+
+class _PriorityNode(Node):
+    """Вузол декартового дерева з випадковим пріоритетом"""
+    __slots__ = ('priority',)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.priority = random.random()
+
+def _is_red(node):
+    """Відсутні вузли вважаються чорними"""
+    return node is not None and node.red
+
+def _level_order(root):
+    """Вузли дерева по рівнях з глибиною: (вузол, глибина)"""
+    level = [root] if root is not None else []
+    depth = 0
+    while level:
+        following = []
+        for node in level:
+            yield node, depth
+            if node.left is not None:
+                following.append(node.left)
+            if node.right is not None:
+                following.append(node.right)
+        level = following
+        depth += 1
+
+def _black_height(node):
+    """Кількість чорних вузлів на лівому краї піддерева"""
+    height = 0
+    while node is not None:
+        if not node.red:
+            height += 1
+        node = node.left
+    return height
+
+class RedBlackTree(BinarySearchTree):
+    """
+    Червоно-чорне дерево.
+
+    Висота не перевищує 2 log2(n + 1). Вставка виконує не більше двох
+    поворотів, видалення - не більше трьох; решта виправлень - лише
+    перефарбування, тож запис дешевший, ніж в AVLTree. З'єднання для
+    split і join вирівнюють чорні висоти, тож split коштує O(log² n).
+    """
+    _node_class = _ColorNode
+    self_balancing = True
+    # Висоту обмежують кольори, перебудова піддерев не потрібна
+    rebuild_factor = None
+
+    def _build(self, nodes):
+        """
+        Ідеально збалансована побудова з розфарбуванням.
+
+        Усі листки такого дерева лежать на двох нижніх рівнях, тож чорні
+        всі рівні, крім найглибшого, а вузли найглибшого рівня - червоні.
+        """
+        root = self._link_balanced(nodes)
+        if root is None:
+            return None
+
+        deepest = root.height - 1
+        for node, depth in _level_order(root):
+            node.red = 0 < depth == deepest
+        return root
+
+    def _after_insert(self, path, node):
+        """Виправляє порушення «червоний батько червоної дитини» знизу вгору"""
+        self._rebalance_path(path)
+
+        while path and path[-1].red:
+            # Червоний батько не є коренем, тож дід існує
+            parent = path.pop()
+            grand = path.pop()
+            uncle = grand.right if grand.left is parent else grand.left
+
+            if _is_red(uncle):
+                # Червоний дядько: перефарбовуємо та піднімаємо порушення до діда
+                parent.red = uncle.red = False
+                grand.red = True
+                node = grand
+                continue
+
+            # Чорний дядько: один чи два повороти завершують виправлення
+            if grand.left is parent:
+                if parent.right is node:
+                    grand.left = self._rotate_left(parent)
+                top = self._rotate_right(grand)
+            else:
+                if parent.left is node:
+                    grand.right = self._rotate_right(parent)
+                top = self._rotate_left(grand)
+
+            top.red = False
+            grand.red = True
+            self._replace_child(path[-1] if path else None, grand, top)
+            # Поворот міг змінити висоти предків
+            for ancestor in reversed(path):
+                self._update(ancestor)
+            break
+
+        self.root.red = False
+
+    def _join_nodes(self, left, middle, right):
+        """
+        З'єднує червоно-чорні піддерева left < middle < right.
+
+        Червоний middle підвішується на краї вищого за чорною висотою
+        піддерева до чорного вузла з тією самою чорною висотою, що в
+        нижчого, а можливе порушення «червоний під червоним» виправляється
+        так само, як після вставки.
+        """
+        # Корені піддерев завжди можна перефарбувати в чорний
+        for root in (left, right):
+            if root is not None:
+                root.red = False
+
+        left_height, right_height = _black_height(left), _black_height(right)
+        if left_height == right_height:
+            middle.left, middle.right = left, right
+            middle.red = False
+            self._update(middle)
+            return middle
+
+        taller_left = left_height > right_height
+        target = right_height if taller_left else left_height
+        height = left_height if taller_left else right_height
+        path = []
+        node = left if taller_left else right
+        while node is not None and (node.red or height != target):
+            path.append(node)
+            if not node.red:
+                height -= 1
+            node = node.right if taller_left else node.left
+
+        middle.red = True
+        if taller_left:
+            middle.left, middle.right = node, right
+            path[-1].right = middle
+        else:
+            middle.left, middle.right = left, node
+            path[-1].left = middle
+        self._update(middle)
+
+        scratch = self._empty_like()
+        scratch.root = path[0]
+        scratch._after_insert(path, middle)
+        return scratch.root
+
+    def _after_remove(self, path, node, child):
+        """Відновлює однакову чорну висоту після вирізання чорного вузла"""
+        self._rebalance_path(path)
+        if node.red:
+            return
+
+        # Місце вирізаного чорного вузла має «подвійну чорноту»
+        current = child
+        while path and not _is_red(current):
+            parent = path[-1]
+            # Брат вирізаного чорного вузла завжди існує
+            left = parent.left is current
+            sibling = parent.right if left else parent.left
+
+            if sibling.red:
+                # Червоний брат: поворот робить брата чорним
+                sibling.red = False
+                parent.red = True
+                top = self._rotate_left(parent) if left else self._rotate_right(parent)
+                self._replace_child(path[-2] if len(path) > 1 else None, parent, top)
+                path.insert(len(path) - 1, top)
+                sibling = parent.right if left else parent.left
+
+            near, far = (sibling.left, sibling.right) if left else (sibling.right, sibling.left)
+            if not _is_red(near) and not _is_red(far):
+                # Чорні племінники: перефарбовуємо брата й піднімаємося
+                sibling.red = True
+                current = path.pop()
+                continue
+
+            if not _is_red(far):
+                # Червоний лише ближній племінник: зводимо до дальнього
+                near.red = False
+                sibling.red = True
+                if left:
+                    sibling = parent.right = self._rotate_right(sibling)
+                else:
+                    sibling = parent.left = self._rotate_left(sibling)
+                far = sibling.right if left else sibling.left
+
+            sibling.red = parent.red
+            parent.red = False
+            far.red = False
+            top = self._rotate_left(parent) if left else self._rotate_right(parent)
+            self._replace_child(path[-2] if len(path) > 1 else None, parent, top)
+            path[-1] = top
+            current = None
+            break
+
+        if current is not None:
+            current.red = False
+        # Повороти могли змінити висоти решти предків
+        for ancestor in reversed(path):
+            self._update(ancestor)
+
+class Treap(BinarySearchTree):
+    """
+    Декартове дерево (treap): BST за ключами та купа за випадковими пріоритетами.
+
+    Форма дерева не залежить від порядку вставки, тож очікувана висота
+    O(log n) навіть для відсортованого введення.
+    """
+    _node_class = _PriorityNode
+    self_balancing = True
+    # Висоту обмежують випадкові пріоритети, перебудова піддерев не потрібна
+    rebuild_factor = None
+
+    def _build(self, nodes):
+        """Збалансована побудова з пріоритетами, що спадають від кореня"""
+        root = self._link_balanced(nodes)
+        priorities = sorted((random.random() for _ in nodes), reverse=True)
+        for (node, _), priority in zip(_level_order(root), priorities):
+            node.priority = priority
+        return root
+
+    def _after_insert(self, path, node):
+        """Піднімає новий вузол поворотами, поки його пріоритет більший за батьківський"""
+        while path and path[-1].priority < node.priority:
+            parent = path.pop()
+            if parent.left is node:
+                self._rotate_right(parent)
+            else:
+                self._rotate_left(parent)
+            self._replace_child(path[-1] if path else None, parent, node)
+
+        for ancestor in reversed(path):
+            self._update(ancestor)
+
+    def _join_nodes(self, left, middle, right):
+        """
+        З'єднує декартові піддерева left < middle < right.
+
+        middle стає коренем і опускається поворотами з дитиною з більшим
+        пріоритетом, доки не задовольнить властивість купи. Під час split
+        middle уже має найбільший пріоритет серед своїх піддерев, тож
+        з'єднання коштує O(1), а split загалом - O(log n).
+        """
+        middle.left, middle.right = left, right
+        self._update(middle)
+        root = parent = None
+        path = []
+        while True:
+            child = middle.left
+            if middle.right is not None and (child is None or middle.right.priority > child.priority):
+                child = middle.right
+            if child is None or child.priority <= middle.priority:
+                break
+
+            top = self._rotate_right(middle) if child is middle.left else self._rotate_left(middle)
+            if parent is None:
+                root = top
+            elif parent.left is middle:
+                parent.left = top
+            else:
+                parent.right = top
+            parent = top
+            path.append(top)
+
+        # Повороти могли змінити висоти вузлів, що піднялися над middle
+        for node in reversed(path):
+            self._update(node)
+        return root if root is not None else middle
+
+class SplayTree(BinarySearchTree):
+    """
+    Розширюване (splay) дерево.
+
+    Кожен вставлений чи знайдений вузол піднімається в корінь, тож часто
+    запитувані ключі лежать біля кореня і знаходяться за кілька кроків.
+    Амортизована вартість операції - O(log n). Пошук змінює форму дерева,
+    тому для читання з кількох потоків дерево потребує блокування писача.
+    """
+    # Глибокі вузли піднімаються розширенням, перебудова піддерев не потрібна
+    rebuild_factor = None
+    # Пошук розширює знайдений вузол у корінь
+    reads_mutate = True
+
+    def _splay(self, path, node):
+        """
+        Піднімає node в корінь поворотами zig, zig-zig та zig-zag.
+
+        Повороти перераховують доповнення знизу вгору, тож предки node
+        не потребують окремого оновлення.
+
+        Args:
+            path (list): Предки node від кореня
+            node (Node): Вузол, що стане коренем
+        """
+        while path:
+            parent = path.pop()
+            if not path:
+                # zig: батько - корінь
+                if parent.left is node:
+                    self._rotate_right(parent)
+                else:
+                    self._rotate_left(parent)
+                self.root = node
+                return
+
+            grand = path.pop()
+            if (grand.left is parent) == (parent.left is node):
+                # zig-zig: спершу поворот діда, потім батька
+                if parent.left is node:
+                    self._rotate_right(grand)
+                    self._rotate_right(parent)
+                else:
+                    self._rotate_left(grand)
+                    self._rotate_left(parent)
+            elif parent.left is node:
+                # zig-zag: node - ліва дитина правої дитини
+                grand.right = self._rotate_right(parent)
+                self._rotate_left(grand)
+            else:
+                # zig-zag: node - права дитина лівої дитини
+                grand.left = self._rotate_left(parent)
+                self._rotate_right(grand)
+            self._replace_child(path[-1] if path else None, grand, node)
+
+    def _after_insert(self, path, node):
+        """Піднімає новий вузол у корінь"""
+        self._splay(path, node)
+
+    def search(self, key):
+        """
+        Шукає вузол із заданим ключем і піднімає його в корінь.
+
+        Якщо ключа немає, в корінь піднімається останній відвіданий вузол.
+
+        Returns:
+            Node: Знайдений вузол (дійсний до наступної зміни, див.
+                BinarySearchTree.search) або None
+        """
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+
+        if node is not None:
+            self._splay(path, node)
+        elif path:
+            last = path.pop()
+            self._splay(path, last)
+        return node
+
+class ScapegoatTree(BinarySearchTree):
+    """
+    Дерево «цапа-відбувайла» (scapegoat).
+
+    Вузли не мають додаткових полів балансу. Якщо новий вузол виявився
+    глибшим за log_{1/alpha}(n), на шляху до кореня знаходиться
+    незбалансований предок (одна дитина важча за alpha від піддерева), і
+    його піддерево перебудовується в ідеально збалансоване. Амортизована
+    вартість вставки та видалення - O(log n).
+
+    Args:
+        multiset (bool): Режим мультимножини
+        alpha (float): Допустима вага дитини, від 0.5 (жорсткіше) до 1
+    """
+    self_balancing = True
+    # Глибину обмежує власний поріг alpha, а не rebuild_factor
+    rebuild_factor = None
+
+    def __init__(self, multiset=False, alpha=0.7):
+        if not 0.5 < alpha < 1:
+            raise ValueError("alpha має бути в межах (0.5, 1)")
+
+        super().__init__(multiset=multiset)
+        self.alpha = alpha
+        # Найбільший розмір з часу останньої повної перебудови
+        self._max_size = 0
+
+    def _empty_like(self, root=None):
+        """Нове дерево з тим самим alpha; найбільшим розміром стає розмір root"""
+        tree = type(self)(multiset=self.multiset, alpha=self.alpha)
+        tree.root = root
+        tree._max_size = _size(root)
+        tree._reset_extremes()
+        return tree
+
+    def _build(self, nodes):
+        """Збалансована побудова зі скиданням найбільшого розміру"""
+        root = self._link_balanced(nodes)
+        self._max_size = _size(root)
+        return root
+
+    def _after_insert(self, path, node):
+        """Перебудовує піддерево цапа-відбувайла, якщо вузол занадто глибокий"""
+        self._rebalance_path(path)
+        size = self.root.size
+        self._max_size = max(self._max_size, size)
+        if len(path) <= math.log(size) / math.log(1 / self.alpha):
+            return
+
+        child = node
+        for index in range(len(path) - 1, -1, -1):
+            ancestor = path[index]
+            if child.size > self.alpha * ancestor.size:
+                self._rebuild_subtree(path, index)
+                return
+            child = ancestor
+
+    def _after_remove(self, path, node, child):
+        """Перебудовує все дерево, коли воно зменшилося нижче alpha від найбільшого"""
+        self._rebalance_path(path)
+        size = _size(self.root)
+        if size < self.alpha * self._max_size:
+            self.root = self._link_balanced(list(self._inorder_nodes()))
+            self._max_size = size
+
+STRATEGIES = {
+    'plain': BinarySearchTree,
+    'avl': AVLTree,
+    'red-black': RedBlackTree,
+    'treap': Treap,
+    'splay': SplayTree,
+    'scapegoat': ScapegoatTree,
+}
+
+def create_tree(strategy='avl', **options):
+    """
+    Створює порожнє дерево із заданою стратегією балансування.
+
+    Args:
+        strategy (str): Назва стратегії з STRATEGIES
+        **options: Параметри конструктора (наприклад, multiset=True)
+
+    Returns:
+        BinarySearchTree: Нове дерево
+
+    Raises:
+        ValueError: Якщо стратегія невідома
+    """
+    try:
+        tree_class = STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Невідома стратегія балансування: {strategy!r}") from None
+    return tree_class(**options)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Порівняльні вимірювання для дерев з модуля bst
+
+Скрипт вимірює час виконання та піковий обсяг додаткової пам'яті
+(через tracemalloc) для різних варіантів обходу дерева.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from array_tree import ArrayTree
+from balancing import STRATEGIES, create_tree
+from btree import BTree
+from bst import AVLTree, BinarySearchTree
+from concurrent_tree import ConcurrentBinarySearchTree
+from parallel_stats import parallel_tree_statistics
+from tree_storage import MappedTree
+from task3 import (
+    sum_tree_iterative,
+    sum_tree_level_order,
+    sum_tree_morris,
+    tree_statistics,
+    tree_statistics_morris,
+    tree_statistics_numpy,
+)
+
+def measure(function, *args):
+    """
+    Вимірює час та піковий обсяг пам'яті, виділеної під час виклику.
+
+    Returns:
+        tuple: (результат, час у секундах, пік пам'яті в байтах)
+    """
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def benchmark_traversals(size=200_000):
+    """Порівнює обходи зі стеком, чергою та обхід Морріса"""
+    print(f"\n📏 Обходи дерева з {size} вузлів")
+
+    values = list(range(size))
+    random.shuffle(values)
+    random_tree = BinarySearchTree()
+    for value in values:
+        random_tree.insert(value)
+
+    # Ідеально збалансоване дерево має найширший нижній рівень для черги
+    perfect = BinarySearchTree.from_iterable(values)
+    cases = [("випадкове дерево", random_tree.root), ("ідеально збалансоване", perfect.root)]
+
+    variants = [
+        ("стек", sum_tree_iterative),
+        ("черга (deque)", sum_tree_level_order),
+        ("Морріс", sum_tree_morris),
+        ("статистика, стек", tree_statistics),
+        ("статистика, Морріс", tree_statistics_morris),
+    ]
+
+    for case_name, root in cases:
+        print(f"   {case_name}:")
+        for name, function in variants:
+            _, elapsed, peak = measure(function, root)
+            print(f"      {name:<20} {elapsed:8.3f} с   пік пам'яті {peak / 1024:10.1f} КіБ")
+
+def benchmark_memory(size=100_000):
+    """Порівнює пам'ять дерева з об'єктів Node та дерева на масивах"""
+    print(f"\n💾 Пам'ять на {size} ключів типу float")
+
+    values = [float(value) for value in range(size)]
+    random.shuffle(values)
+
+    def build_node_tree():
+        tree = BinarySearchTree()
+        for value in values:
+            tree.insert(value)
+        return tree
+
+    def build_array_tree():
+        tree = ArrayTree('d')
+        for value in values:
+            tree.insert(value)
+        return tree
+
+    for name, build in [("Node-об'єкти", build_node_tree), ("ArrayTree", build_array_tree)]:
+        # Під tracemalloc час спотворений, тож тут вимірюємо лише пам'ять
+        _, _, peak = measure(build)
+        print(f"   {name:<14} {peak / size:6.1f} байт/ключ")
+
+def benchmark_statistics(size=2_000_000):
+    """Порівнює статистику на чистому Python та векторизовану на NumPy"""
+    print(f"\n📊 Статистика для {size} ключів типу float")
+
+    values = [random.random() for _ in range(size)]
+    array_tree = ArrayTree.from_iterable(values)
+    node_tree = BinarySearchTree.from_iterable(values)
+
+    variants = [
+        ("tree_statistics, Node", tree_statistics, node_tree.root),
+        ("NumPy, Node", tree_statistics_numpy, node_tree),
+        ("NumPy, ArrayTree", tree_statistics_numpy, array_tree),
+    ]
+    for name, function, source in variants:
+        start_time = time.perf_counter()
+        function(source)
+        elapsed = time.perf_counter() - start_time
+        print(f"   {name:<24} {elapsed:8.3f} с")
+
+def benchmark_parallel_statistics(size=2_000_000, worker_counts=(1, 2, 4, 8)):
+    """Масштабування parallel_tree_statistics за кількістю процесів"""
+    print(f"\n🧮 Паралельна агрегація {size} ключів (ядер: {os.cpu_count()})")
+
+    values = [random.random() for _ in range(size)]
+    sources = [
+        ('ArrayTree', ArrayTree.from_iterable(values)),
+        ('Node (обхід піддерев)', AVLTree.from_iterable(values).root),
+    ]
+    for name, source in sources:
+        for workers in worker_counts:
+            start_time = time.perf_counter()
+            parallel_tree_statistics(source, workers=workers)
+            elapsed = time.perf_counter() - start_time
+            print(f"   {name:<24} {workers} процесів: {elapsed:8.3f} с")
+
+def benchmark_cold_start(size=1_000_000):
+    """Холодний старт: повторні вставки проти load і MappedTree"""
+    print(f"\n🗄️  Відновлення дерева з {size} ключів з диска")
+
+    tree = AVLTree.from_iterable(random.random() for _ in range(size))
+    keys = tree.display_inorder()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tree.bin')
+        tree.save(path)
+
+        def reinsert():
+            restored = AVLTree()
+            for key in keys:
+                restored.insert(key)
+            return restored
+
+        def query_mapped():
+            with MappedTree.open(path) as mapped:
+                return mapped.find_max(), mapped.sum_range(0.25, 0.75)
+
+        variants = [
+            ("insert кожного ключа", reinsert),
+            ("AVLTree.load", lambda: AVLTree.load(path)),
+            ("MappedTree + запити", query_mapped),
+        ]
+        for name, function in variants:
+            start_time = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start_time
+            print(f"   {name:<24} {elapsed:8.3f} с")
+
+def benchmark_btree(size=500_000, cache_pages=64):
+    """Читання сторінок B-дерева з буферним пулом, значно меншим за дані"""
+    print(f"\n📚 B-дерево на диску: {size} ключів, пул на {cache_pages} сторінок")
+
+    values = [random.random() for _ in range(size)]
+    with tempfile.TemporaryDirectory() as directory:
+        with BTree(os.path.join(directory, 'keys.db'), cache_pages=cache_pages) as tree:
+            start_time = time.perf_counter()
+            for value in values:
+                tree.insert(value)
+            elapsed = time.perf_counter() - start_time
+            print(f"   insert: {elapsed:8.3f} с, висота {tree.height()}, "
+                  f"{tree.page_reads / size:.2f} читань сторінок на вставку")
+
+            reads = tree.page_reads
+            probes = random.sample(values, 10_000)
+            for value in probes:
+                tree.contains(value)
+            print(f"   contains: {(tree.page_reads - reads) / len(probes):.2f} читань сторінок на запит")
+
+def benchmark_balancing(size=100_000, lookups=200_000):
+    """
+    Порівнює стратегії балансування на типових навантаженнях.
+
+    - послідовна вставка: ключі надходять відсортованими (журнали, часові ряди)
+    - випадкова вставка: ключі в довільному порядку
+    - перекошене читання: 90% пошуків припадає на 100 гарячих ключів
+    - змішаний запис: вставки та видалення навпіл
+    """
+    print(f"\n🌳 Стратегії балансування ({size} ключів, час у секундах)")
+
+    values = random.sample(range(size * 10), size)
+    hot = values[:100]
+    probes = [random.choice(hot) if random.random() < 0.9 else random.choice(values)
+              for _ in range(lookups)]
+    churn = [(random.random() < 0.5, random.choice(values)) for _ in range(lookups)]
+
+    def sequential(tree):
+        for value in range(size):
+            tree.insert(value)
+
+    def shuffled(tree):
+        for value in values:
+            tree.insert(value)
+
+    def skewed_reads(tree):
+        for value in probes:
+            tree.contains(value)
+
+    def mixed_writes(tree):
+        for is_insert, value in churn:
+            if is_insert:
+                tree.insert(value)
+            else:
+                tree.delete(value)
+
+    workloads = [
+        ("послідовна", sequential, False),
+        ("випадкова", shuffled, False),
+        ("перекошене читання", skewed_reads, True),
+        ("змішаний запис", mixed_writes, True),
+    ]
+    print(f"   {'стратегія':<10}" + "".join(f"{name:>20}" for name, _, _ in workloads) + f"{'висота':>8}")
+    for strategy in STRATEGIES:
+        row = []
+        for _, workload, prefilled in workloads:
+            tree = create_tree(strategy)
+            if prefilled:
+                shuffled(tree)
+            start_time = time.perf_counter()
+            workload(tree)
+            row.append(time.perf_counter() - start_time)
+        print(f"   {strategy:<10}" + "".join(f"{elapsed:20.3f}" for elapsed in row) + f"{tree.height():8}")
+
+def check_invariants(root, balanced=True):
+    """
+    Перевіряє впорядкованість ключів і доповнення кожного вузла (та AVL-баланс).
+
+    Returns:
+        int: Кількість вузлів
+
+    Raises:
+        AssertionError: Якщо якийсь інваріант порушено
+    """
+    checked = {}
+    # Обхід у зворотному порядку: діти перевіряються раніше за батьків
+    stack = [(root, None, None, False)] if root is not None else []
+    while stack:
+        node, lo, hi, children_done = stack.pop()
+        if not children_done:
+            assert lo is None or node.key > lo, "порушено порядок ключів"
+            assert hi is None or node.key < hi, "порушено порядок ключів"
+            stack.append((node, lo, hi, True))
+            if node.left is not None:
+                stack.append((node.left, lo, node.key, False))
+            if node.right is not None:
+                stack.append((node.right, node.key, hi, False))
+            continue
+
+        left = checked.pop(id(node.left), (0, 0, 0)) if node.left is not None else (0, 0, 0)
+        right = checked.pop(id(node.right), (0, 0, 0)) if node.right is not None else (0, 0, 0)
+        height = 1 + max(left[0], right[0])
+        size = node.count + left[1] + right[1]
+        total = node.key * node.count + left[2] + right[2]
+        assert node.height == height, "невірна висота"
+        assert node.size == size, "невірний розмір піддерева"
+        assert node.total == total, "невірна сума піддерева"
+        if balanced:
+            assert abs(left[0] - right[0]) <= 1, "порушено AVL-баланс"
+        checked[id(node)] = (height, size, total)
+
+    return root.size if root is not None else 0
+
+def stress_concurrent_tree(writers=4, readers=4, operations=20_000):
+    """Стрес-тест ConcurrentBinarySearchTree: інваріанти під конкуренцією"""
+    print(f"\n🧵 Стрес-тест: {writers} писачів, {readers} читачів")
+
+    tree = ConcurrentBinarySearchTree()
+    stop = threading.Event()
+    errors = []
+
+    def writer_operations(offset):
+        # Кожен писач працює зі своїми ключами, тож результат передбачуваний
+        rng = random.Random(offset)
+        for _ in range(operations):
+            key = rng.randrange(1000) * writers + offset
+            yield rng.random() < 0.7, key
+
+    def writer(offset):
+        for inserting, key in writer_operations(offset):
+            if inserting:
+                tree.insert(key)
+            else:
+                tree.delete(key)
+
+    def reader():
+        # Кожен виклик має бачити узгоджений стан; між викликами дерево може змінитися
+        while not stop.is_set():
+            try:
+                low, high = tree.find_min_max()
+                if low is not None and low > high:
+                    errors.append((low, high))
+                tree.sum_range(250, 750)
+                tree.contains(random.randrange(1000 * writers))
+            except Exception as error:
+                errors.append(error)
+
+    threads = [threading.Thread(target=writer, args=(offset,)) for offset in range(writers)]
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in reader_threads + threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+
+    # Послідовне повторення операцій кожного писача дає очікуваний вміст
+    expected = set()
+    for offset in range(writers):
+        for inserting, key in writer_operations(offset):
+            if inserting:
+                expected.add(key)
+            else:
+                expected.discard(key)
+
+    size = check_invariants(tree._tree.root)
+    assert not errors, f"неузгоджені читання: {errors[:3]}"
+    assert size == tree.count_nodes() == len(tree.display_inorder())
+    assert tree.display_inorder() == sorted(expected), "втрачені або зайві записи"
+    print(f"   ✅ Інваріанти збережено, вузлів у дереві: {size}")
+
+def benchmark_concurrent_throughput(thread_counts=(1, 2, 4, 8), duration=1.0, write_ratio=0.1):
+    """Пропускна здатність ConcurrentBinarySearchTree залежно від кількості потоків"""
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"\n🚦 Пропускна здатність ({int(write_ratio * 100)}% записів, GIL {'увімкнено' if gil_enabled else 'вимкнено'})")
+
+    for thread_count in thread_counts:
+        tree = ConcurrentBinarySearchTree()
+        tree.insert_many(range(0, 200_000, 2))
+        stop = threading.Event()
+        counts = [0] * thread_count
+
+        def worker(index):
+            rng = random.Random(index)
+            done = 0
+            while not stop.is_set():
+                key = rng.randrange(200_000)
+                if rng.random() < write_ratio:
+                    tree.insert(key)
+                else:
+                    tree.contains(key)
+                done += 1
+            counts[index] = done
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        print(f"   {thread_count} потоків: {sum(counts) / duration:12,.0f} операцій/с")
+
+def main():
+    """Запуск усіх вимірювань"""
+    print("⏱️  Порівняльні вимірювання дерев")
+    print("=" * 70)
+    benchmark_traversals()
+    benchmark_memory()
+    benchmark_statistics()
+    benchmark_parallel_statistics()
+    benchmark_cold_start()
+    benchmark_btree()
+    benchmark_balancing()
+    stress_concurrent_tree()
+    benchmark_concurrent_throughput()
+
+if __name__ == "__main__":
+    main()
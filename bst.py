@@ -0,0 +1,1353 @@
+"""
+Спільна реалізація дерев пошуку для завдань 1-3
+
+Реалізація включає:
+- Клас Node для представлення вузла дерева
+- Клас BinarySearchTree для двійкового дерева пошуку
+- Клас AVLTree для самобалансованого AVL-дерева з тим самим інтерфейсом
+- Функцію morris_inorder для обходу з O(1) додаткової пам'яті
+- Функцію iter_keys для значень вузла чи дерева будь-якого класу
+"""
+
+import math
+from collections import OrderedDict
+from itertools import repeat
+
+class Node:
+    """Клас для представлення вузла дерева"""
+    # __slots__ прибирає словник атрибутів з кожного вузла
+    __slots__ = ('key', 'left', 'right', 'count', 'height', 'size', 'total')
+
+    def __init__(self, key):
+        self.key = key
+        self.left = None
+        self.right = None
+        # Кратність ключа (більше 1 лише в режимі мультимножини)
+        self.count = 1
+        # Доповнення піддерева: висота, кількість значень та сума ключів
+        self.height = 1
+        self.size = 1
+        self.total = key
+
+def _height(node):
+    """Висота піддерева (0 для порожнього)"""
+    return node.height if node is not None else 0
+
+def _size(node):
+    """Кількість вузлів у піддереві (0 для порожнього)"""
+    return node.size if node is not None else 0
+
+def _total(node):
+    """Сума ключів піддерева (0 для порожнього)"""
+    return node.total if node is not None else 0
+
+def morris_inorder(root):
+    """
+    Обхід Морріса: значення в порядку зростання з O(1) додаткової пам'яті.
+
+    Замість стека обхід тимчасово прошиває порожні праві вказівники
+    попередників назад на поточний вузол і знімає кожну прошивку при
+    другому проході. Після завершення (або закриття генератора раніше)
+    дерево відновлюється повністю. Поки обхід триває, дерево не можна
+    читати з інших потоків чи змінювати.
+
+    Args:
+        root (Node): Корінь дерева
+
+    Yields:
+        int/float: Значення в порядку зростання (з урахуванням кратності)
+    """
+    current = root
+    try:
+        while current is not None:
+            if current.left is None:
+                key, count = current.key, current.count
+                current = current.right
+                yield from repeat(key, count)
+                continue
+
+            predecessor = current.left
+            while predecessor.right is not None and predecessor.right is not current:
+                predecessor = predecessor.right
+
+            if predecessor.right is None:
+                # Перший візит: прошиваємо шлях назад і йдемо ліворуч
+                predecessor.right = current
+                current = current.left
+            else:
+                # Другий візит: ліве піддерево пройдено, знімаємо прошивку
+                predecessor.right = None
+                key, count = current.key, current.count
+                current = current.right
+                yield from repeat(key, count)
+    finally:
+        # Якщо генератор закрили раніше, доходимо до кінця без видачі значень,
+        # щоб зняти всі прошивки, що ще залишилися
+        while current is not None:
+            if current.left is None:
+                current = current.right
+                continue
+            predecessor = current.left
+            while predecessor.right is not None and predecessor.right is not current:
+                predecessor = predecessor.right
+            if predecessor.right is None:
+                predecessor.right = current
+                current = current.left
+            else:
+                predecessor.right = None
+                current = current.right
+
+# Маркер вичерпаного ітератора в узгоджених проходах
+_MISSING = object()
+
+def iter_keys(source):
+    """
+    Значення в порядку зростання для кореня Node або будь-якого дерева.
+
+    Для голого вузла (або None) використовується обхід Морріса, а дерева
+    (BinarySearchTree, ArrayTree, ...) обходяться власним __iter__.
+    """
+    if source is None or isinstance(source, Node):
+        return morris_inorder(source)
+    return iter(source)
+
+class BinarySearchTree:
+    """Клас для двійкового дерева пошуку"""
+    # Скільки звільнених вузлів тримати для повторного використання; вузол із
+    # пулу отримує новий ключ, тож посилання на вузли (результати search)
+    # недійсні після будь-якої зміни дерева. 0 вимикає пул
+    node_pool_limit = 1024
+    # Скільки результатів параметризованих запитів (sum_range, percentile, ...)
+    # тримати в LRU-кеші між змінами; 0 вимикає кеш
+    query_cache_size = 256
+    # Самовідновлення: піддерево перебудовується, коли глибина нового вузла
+    # перевищує rebuild_factor * log2(n); None вимикає перевірку. Випадковий
+    # порядок вставки майже ніколи не сягає 3 log2(n), а вироджені дерева
+    # (наприклад, побудовані з відсортованих даних) лікуються при вставці
+    rebuild_factor = 3.0
+    # Чи тримає дерево висоту O(log n) після кожної вставки; від цього
+    # залежить, чи можна вставляти малі пакети insert_many поштучно
+    self_balancing = False
+    # Чи змінюють запити на читання (search, contains, ...) форму дерева;
+    # такі дерева не можна читати з кількох потоків без блокування писача
+    reads_mutate = False
+    # Клас вузлів; стратегії балансування підставляють підклас з власними полями
+    _node_class = Node
+
+    def __init__(self, multiset=False):
+        """
+        Args:
+            multiset (bool): Режим мультимножини - повторні ключі не відкидаються,
+                а збільшують лічильник кратності свого вузла
+        """
+        self.root = None
+        self.multiset = multiset
+        # Вказівники на крайні вузли роблять find_min/find_max сталими за часом
+        self._min_node = None
+        self._max_node = None
+        # Пул звільнених вузлів: видалення з подальшою вставкою не алокують нових
+        self._node_pool = []
+        # Номер версії вмісту: зростає з кожною зміною та робить кеш запитів недійсним
+        self.version = 0
+        self._query_cache = OrderedDict()
+        self._cache_version = 0
+
+    @classmethod
+    def from_iterable(cls, iterable, **options):
+        """
+        Створює ідеально збалансоване дерево з довільної послідовності значень.
+
+        Args:
+            iterable: Значення у будь-якому порядку, можливо з дублікатами
+            **options: Параметри конструктора (наприклад, multiset=True)
+
+        Returns:
+            BinarySearchTree: Нове дерево того самого класу
+        """
+        tree = cls(**options)
+        tree.bulk_load(iterable)
+        return tree
+
+    def bulk_load(self, iterable):
+        """
+        Замінює вміст дерева значеннями з iterable за O(n) після сортування.
+
+        Timsort розпізнає вже відсортовані серії за один лінійний прохід,
+        тому для відсортованого введення вся побудова лінійна. Дублікати
+        відкидаються, як і в insert (у режимі мультимножини - враховуються
+        в кратності вузла).
+        """
+        self.version += 1
+        keys = list(iterable)
+        keys.sort()
+
+        # Групуємо однакові ключі за один прохід
+        nodes = []
+        for key in keys:
+            self._append_sorted(nodes, key)
+
+        self.root = self._build(nodes)
+        self._reset_extremes()
+
+    def save(self, path):
+        """
+        Зберігає дерево в компактний двійковий файл (див. tree_storage).
+
+        Файл можна відновити через load або відкрити для читання без
+        побудови вузлів через tree_storage.MappedTree.open.
+        """
+        from tree_storage import save_tree
+        save_tree(self, path)
+
+    @classmethod
+    def load(cls, path, **options):
+        """
+        Відновлює дерево, збережене методом save, за O(n) без вставок.
+
+        Args:
+            path (str): Шлях до файлу
+            **options: Параметри конструктора (multiset береться з файлу)
+
+        Returns:
+            BinarySearchTree: Нове дерево того самого класу
+        """
+        from tree_storage import load_tree
+        return load_tree(cls, path, **options)
+
+    def enable_instrumentation(self):
+        """
+        Вмикає лічильники операцій цього дерева (див. instrumentation).
+
+        Поки лічильники вимкнені, дерево працює без жодних обгорток.
+
+        Returns:
+            TreeMetrics: Лічильники зі snapshot() та to_prometheus()
+        """
+        from instrumentation import instrument
+        return instrument(self)
+
+    def disable_instrumentation(self):
+        """Вимикає лічильники, повертаючи прямі виклики методів класу"""
+        from instrumentation import uninstrument
+        uninstrument(self)
+
+    def _append_sorted(self, nodes, key):
+        """Дописує ключ у відсортований список вузлів, склеюючи дублікати з останнім"""
+        if nodes and nodes[-1].key == key:
+            if self.multiset:
+                nodes[-1].count += 1
+        else:
+            nodes.append(self._node_class(key))
+
+    def insert_many(self, iterable):
+        """
+        Пакетна вставка значень.
+
+        Пакет сортується один раз. Якщо дерево самобалансоване, а пакет
+        малий порівняно з ним (m * log2(n) < n), значення вставляються по
+        одному за O(m log n). Інакше відсортований пакет зливається з
+        in-order послідовністю наявних вузлів, і дерево перебудовується в
+        ідеально збалансоване за O(n + m), перевикористовуючи наявні вузли.
+
+        Args:
+            iterable: Значення у будь-якому порядку, можливо з дублікатами
+        """
+        batch = sorted(iterable)
+        if not batch:
+            return
+
+        if self.self_balancing and self._prefers_descents(len(batch)):
+            for key in batch:
+                self.insert(key)
+            return
+
+        self.version += 1
+
+        # Злиття двох відсортованих послідовностей: наявні вузли та нові ключі
+        merged = []
+        position = 0
+        for node in self._inorder_nodes():
+            while position < len(batch) and batch[position] < node.key:
+                self._append_sorted(merged, batch[position])
+                position += 1
+            while position < len(batch) and batch[position] == node.key:
+                if self.multiset:
+                    node.count += 1
+                position += 1  # Дублікат наявного ключа
+            merged.append(node)
+
+        for key in batch[position:]:
+            self._append_sorted(merged, key)
+
+        self.root = self._build(merged)
+        self._reset_extremes()
+
+    def _prefers_descents(self, batch_size):
+        """Чи дешевші batch_size окремих спусків (m * log2(n) < n), ніж прохід усього дерева"""
+        size = self.count_nodes()
+        return batch_size * size.bit_length() < size
+
+    def _take_root(self):
+        """Забирає всі вузли дерева (для split, join, merge), залишаючи його порожнім"""
+        self.version += 1
+        root = self.root
+        self.root = self._min_node = self._max_node = None
+        return root
+
+    def _ensure_mutable(self):
+        """
+        Перевіряє, що вузли дерева можна перев'язувати.
+
+        Викликається join і merge до будь-яких змін; незмінні підкласи
+        (знімки, що ділять вузли з живим деревом) викликають тут TypeError.
+        """
+
+    def _empty_like(self, root=None):
+        """
+        Нове дерево того самого класу та режиму з готовим коренем.
+
+        Через цей хук split, join, merge та _join_nodes створюють усі
+        результати й тимчасові дерева, тож стратегії з власними параметрами
+        конструктора перевизначають його, щоб переносити свою конфігурацію.
+        """
+        tree = type(self)(multiset=self.multiset)
+        tree.root = root
+        tree._reset_extremes()
+        return tree
+
+    def _join_nodes(self, left, middle, right):
+        """
+        З'єднує піддерева left < middle < right за O(|h(left) - h(right)| + 1).
+
+        Нижче піддерево разом з middle підвішується на тому краї вищого, де
+        висоти майже рівні, після чого шлях по краю балансується знизу
+        вгору, як після вставки. Для AVLTree результат лишається AVL-деревом,
+        для звичайного дерева висота не перевищує max(h(left), h(right)) + 1.
+
+        Returns:
+            Node: Корінь з'єднаного піддерева
+        """
+        limit = min(_height(left), _height(right)) + 1
+        if _height(left) <= limit and _height(right) <= limit:
+            middle.left, middle.right = left, right
+            return self._rebalance(middle)
+
+        # Спуск по правому краю лівого піддерева або по лівому краю правого
+        taller_left = _height(left) > _height(right)
+        path = []
+        node = left if taller_left else right
+        while _height(node) > limit:
+            path.append(node)
+            node = node.right if taller_left else node.left
+
+        if taller_left:
+            middle.left, middle.right = node, right
+            path[-1].right = middle
+        else:
+            middle.left, middle.right = left, node
+            path[-1].left = middle
+        path.append(middle)
+
+        # Тимчасове дерево з коренем path[0], щоб балансування могло змінити корінь
+        scratch = self._empty_like()
+        scratch.root = path[0]
+        scratch._rebalance_path(path)
+        return scratch.root
+
+    def split(self, key):
+        """
+        Розділяє дерево на два: ключі, менші за key, та ключі >= key.
+
+        Шлях пошуку key розрізає дерево на O(h) піддерев, які з'єднуються
+        знизу вгору через _join_nodes; для AVLTree загальна вартість
+        O(log n). Вузли переносяться без копіювання, тож саме дерево після
+        виклику порожнє.
+
+        Returns:
+            tuple: (дерево з ключами < key, дерево з ключами >= key)
+        """
+        path = []
+        node = self._take_root()
+        while node is not None:
+            path.append(node)
+            node = node.left if key <= node.key else node.right
+
+        left = right = None
+        for node in reversed(path):
+            if key <= node.key:
+                right = self._join_nodes(right, node, node.right)
+            else:
+                left = self._join_nodes(node.left, node, left)
+
+        return self._empty_like(left), self._empty_like(right)
+
+    @classmethod
+    def join(cls, left, right):
+        """
+        З'єднує два дерева, де всі ключі left менші за всі ключі right.
+
+        Найменший вузол right стає з'єднувальним, тож для AVLTree вартість
+        O(log n). Обидва дерева після виклику порожні.
+
+        Args:
+            left (BinarySearchTree): Дерево з меншими ключами
+            right (BinarySearchTree): Дерево з більшими ключами того самого класу
+
+        Returns:
+            BinarySearchTree: Нове дерево з ключами обох
+
+        Raises:
+            TypeError: Якщо дерева різних класів
+            ValueError: Якщо діапазони ключів перетинаються
+        """
+        if type(left) is not type(right):
+            raise TypeError("Можна з'єднувати лише дерева одного класу")
+        left._ensure_mutable()
+        right._ensure_mutable()
+        if left.root is not None and right.root is not None and not left.find_max() < right.find_min():
+            raise ValueError("Усі ключі лівого дерева мають бути меншими за ключі правого")
+
+        if right.root is None:
+            return left._empty_like(left._take_root())
+
+        # Вирізаємо найменший вузол правого дерева без повернення в пул
+        path = []
+        middle = right.root
+        while middle.left is not None:
+            path.append(middle)
+            middle = middle.left
+        right._replace_child(path[-1] if path else None, middle, middle.right)
+        right._after_remove(path, middle, middle.right)
+
+        root = left._join_nodes(left._take_root(), middle, right._take_root())
+        return left._empty_like(root)
+
+    @classmethod
+    def merge(cls, first, second):
+        """
+        Зливає два дерева з довільними (можливо, перетинними) ключами за O(n + m).
+
+        In-order послідовності вузлів обох дерев зливаються одним лінійним
+        проходом, як у сортуванні злиттям, і результат будується в
+        ідеально збалансоване дерево з тих самих вузлів. Однакові ключі
+        склеюються (у режимі мультимножини кратності додаються). Обидва
+        дерева після виклику порожні.
+
+        Returns:
+            BinarySearchTree: Нове дерево класу та режиму first
+
+        Raises:
+            TypeError: Якщо дерева різних класів
+        """
+        if type(first) is not type(second):
+            raise TypeError("Можна зливати лише дерева одного класу")
+        first._ensure_mutable()
+        second._ensure_mutable()
+
+        merged = []
+        others = second._inorder_nodes()
+        other = next(others, None)
+        for node in first._inorder_nodes():
+            while other is not None and other.key < node.key:
+                merged.append(other)
+                other = next(others, None)
+            if other is not None and other.key == node.key:
+                if first.multiset:
+                    node.count += other.count
+                other = next(others, None)
+            merged.append(node)
+        while other is not None:
+            merged.append(other)
+            other = next(others, None)
+
+        second._take_root()
+        first._take_root()
+        tree = first._empty_like()
+        tree.root = tree._build(merged)
+        tree._reset_extremes()
+        return tree
+
+    def delete(self, key):
+        """
+        Видаляє значення з дерева.
+
+        Вузол з двома дітьми отримує ключ свого наступника, а фізично
+        видаляється вузол наступника. Шлях до кореня оновлюється через
+        _rebalance_path, тож AVLTree при цьому відновлює баланс поворотами.
+        У режимі мультимножини видаляється одне входження ключа.
+
+        Returns:
+            bool: True, якщо значення було знайдено та видалено
+        """
+        path = []
+        current = self.root
+        while current is not None and current.key != key:
+            path.append(current)
+            current = current.left if key < current.key else current.right
+
+        if current is None:
+            return False
+
+        self.version += 1
+        if current.count > 1:
+            self._decrement(path, current)
+            return True
+
+        if current.left is not None and current.right is not None:
+            # Вузол з двома дітьми: замінюємо ключ наступником
+            path.append(current)
+            successor = current.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            current.key = successor.key
+            current.count = successor.count
+            current = successor
+
+        self._remove_node(path, current)
+        return True
+
+    def pop_min(self):
+        """
+        Видаляє та повертає найменше значення.
+
+        Returns:
+            int/float: Найменше значення або None, якщо дерево порожнє
+        """
+        if self.root is None:
+            return None
+
+        self.version += 1
+
+        path = []
+        node = self.root
+        while node.left is not None:
+            path.append(node)
+            node = node.left
+
+        key = node.key
+        if node.count > 1:
+            self._decrement(path, node)
+        else:
+            self._remove_node(path, node)
+        return key
+
+    def pop_max(self):
+        """
+        Видаляє та повертає найбільше значення.
+
+        Returns:
+            int/float: Найбільше значення або None, якщо дерево порожнє
+        """
+        if self.root is None:
+            return None
+
+        self.version += 1
+
+        path = []
+        node = self.root
+        while node.right is not None:
+            path.append(node)
+            node = node.right
+
+        key = node.key
+        if node.count > 1:
+            self._decrement(path, node)
+        else:
+            self._remove_node(path, node)
+        return key
+
+    def _decrement(self, path, node):
+        """Зменшує кратність вузла без зміни структури та оновлює доповнення шляху"""
+        node.count -= 1
+        path.append(node)
+        self._rebalance_path(path)
+
+    def _remove_node(self, path, node):
+        """
+        Вирізає вузол з не більше ніж однією дитиною та повертає його в пул.
+
+        Args:
+            path (list): Предки node від кореня
+            node (Node): Вузол, що видаляється
+        """
+        child = node.left if node.left is not None else node.right
+        parent = path[-1] if path else None
+        self._replace_child(parent, node, child)
+
+        # Новий крайній вузол - крайній у піддереві дитини або батько
+        if node is self._min_node:
+            self._min_node = parent
+            if child is not None:
+                self._min_node = child
+                while self._min_node.left is not None:
+                    self._min_node = self._min_node.left
+        if node is self._max_node:
+            self._max_node = parent
+            if child is not None:
+                self._max_node = child
+                while self._max_node.right is not None:
+                    self._max_node = self._max_node.right
+
+        self._after_remove(path, node, child)
+        self._recycle_node(node)
+
+    def _after_remove(self, path, node, child):
+        """
+        Хук після вирізання вузла: оновлює доповнення предків і балансує їх.
+
+        Args:
+            path (list): Предки вирізаного вузла від кореня
+            node (Node): Вирізаний вузол (ще не повернутий у пул)
+            child (Node): Дитина, що зайняла його місце, або None
+        """
+        self._rebalance_path(path)
+
+    def _inorder_nodes(self, root=None):
+        """
+        Генератор вузлів у порядку зростання ключів (для злиття та перебудови).
+
+        Args:
+            root (Node): Корінь піддерева (за замовчуванням - усього дерева)
+        """
+        stack = []
+        current = self.root if root is None else root
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            # Наступника запам'ятовуємо до видачі: отримувач може перев'язати вузол
+            following = current.right
+            yield current
+            current = following
+
+    @staticmethod
+    def _link_balanced(nodes):
+        """
+        Зв'язує відсортовані вузли в ідеально збалансоване піддерево без рекурсії.
+
+        Вузли можуть бути як новими, так і взятими з наявного дерева: їхні
+        дочірні вказівники та доповнення повністю перезаписуються.
+
+        Args:
+            nodes (list): Вузли з відсортованими унікальними ключами
+
+        Returns:
+            Node: Корінь побудованого піддерева або None
+        """
+        if not nodes:
+            return None
+
+        linked = []
+        # Елементи стека: (lo, hi) - напіввідкритий діапазон позицій піддерева
+        stack = [(0, len(nodes))]
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            # Висота ідеально збалансованого піддерева з m вузлів дорівнює m.bit_length()
+            node.height = (hi - lo).bit_length()
+            linked.append(node)
+
+            if lo < mid:
+                node.left = nodes[(lo + mid) // 2]
+                stack.append((lo, mid))
+            else:
+                node.left = None
+            if mid + 1 < hi:
+                node.right = nodes[(mid + 1 + hi) // 2]
+                stack.append((mid + 1, hi))
+            else:
+                node.right = None
+
+        # Діти обробляються після батьків, тож зворотний порядок рахує розміри та суми знизу вгору
+        for node in reversed(linked):
+            node.size = node.count + _size(node.left) + _size(node.right)
+            node.total = node.key * node.count + _total(node.left) + _total(node.right)
+
+        return nodes[len(nodes) // 2]
+
+    def _build(self, nodes):
+        """
+        Будує дерево з відсортованих вузлів (bulk_load, insert_many, load).
+
+        Стратегії балансування з власними полями вузлів (колір, пріоритет)
+        перевизначають метод, щоб заповнити ці поля для побудованої форми.
+
+        Returns:
+            Node: Корінь побудованого дерева або None
+        """
+        return self._link_balanced(nodes)
+
+    def _rebuild_subtree(self, path, index):
+        """
+        Перебудовує піддерево вузла path[index] в ідеально збалансоване.
+
+        Вузли перевикористовуються, тож перебудова займає O(m) для піддерева
+        з m вузлів. Предки оновлюються, бо висота піддерева могла змінитися.
+
+        Args:
+            path (list): Шлях від кореня
+            index (int): Позиція кореня піддерева в path
+
+        Returns:
+            Node: Новий корінь піддерева
+        """
+        node = path[index]
+        subtree = self._link_balanced(list(self._inorder_nodes(node)))
+        self._replace_child(path[index - 1] if index > 0 else None, node, subtree)
+        for i in range(index - 1, -1, -1):
+            self._update(path[i])
+        return subtree
+
+    def insert(self, key):
+        """Вставка нового значення в дерево (ітеративно, без рекурсії)"""
+        if self.root is None:
+            self.version += 1
+            self.root = self._new_node(key)
+            self._after_insert([], self.root)
+            return
+
+        # Спускаємося до місця вставки, запам'ятовуючи шлях
+        path = []
+        current = self.root
+        while current is not None:
+            path.append(current)
+            if key < current.key:
+                current = current.left
+            elif key > current.key:
+                current = current.right
+            else:
+                # Якщо key == node.key, не вставляємо дублікат;
+                # у режимі мультимножини збільшуємо кратність вузла
+                if self.multiset:
+                    self.version += 1
+                    current.count += 1
+                    self._rebalance_path(path)
+                return
+
+        self.version += 1
+        parent = path[-1]
+        node = self._new_node(key)
+        if key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+
+        self._after_insert(path, node)
+
+    def _after_insert(self, path, node):
+        """
+        Хук після приєднання нового вузла: оновлює доповнення (висоту,
+        розмір, суму) на шляху до кореня та балансує його.
+
+        Args:
+            path (list): Предки нового вузла від кореня (порожній для кореня)
+            node (Node): Новий вузол
+        """
+        self._rebalance_path(path)
+
+        if self.rebuild_factor is not None:
+            limit = self.rebuild_factor * math.log2(self.root.size + 1)
+            if path and len(path) + 1 > limit:
+                self._repair_path(path)
+
+    def _repair_path(self, path):
+        """
+        Перебудовує піддерево «цапа-відбувайла» на шляху до занадто глибокого вузла.
+
+        Якщо глибина перевищує rebuild_factor * log2(n), на шляху є предок,
+        одна дитина якого важча за alpha = 2 ** (-1 / rebuild_factor) від
+        його піддерева. Перебудовується найвищий такий предок: його
+        дисбаланс накопичувався щонайменше пропорційно розміру піддерева,
+        тож перебудова за O(m) амортизується до O(log n) на вставку, а
+        глибокий ланцюжок старого дерева виправляється однією перебудовою
+        біля кореня - без окремої міграції.
+
+        Args:
+            path (list): Предки нового вузла від кореня
+        """
+        alpha = 2 ** (-1 / self.rebuild_factor)
+        for index, node in enumerate(path):
+            if max(_size(node.left), _size(node.right)) > alpha * node.size:
+                self._rebuild_subtree(path, index)
+                return
+
+    def _new_node(self, key):
+        """
+        Створює вузол для вставки (з пулу, якщо там є вільний) та оновлює
+        вказівники на мінімум і максимум.
+        """
+        if self._node_pool:
+            node = self._node_pool.pop()
+            node.__init__(key)  # Повна переініціалізація полів перевикористаного вузла
+        else:
+            node = self._node_class(key)
+        if self._min_node is None or key < self._min_node.key:
+            self._min_node = node
+        if self._max_node is None or key > self._max_node.key:
+            self._max_node = node
+        return node
+
+    def _recycle_node(self, node):
+        """Повертає видалений вузол у пул, не тримаючи посилань на ключ і дітей"""
+        node.key = node.total = None
+        node.left = node.right = None
+        if len(self._node_pool) < self.node_pool_limit:
+            self._node_pool.append(node)
+
+    def _reset_extremes(self):
+        """Заново знаходить крайні вузли спуском по лівому та правому краю, O(h)"""
+        self._min_node = self._max_node = self.root
+        if self.root is None:
+            return
+        while self._min_node.left is not None:
+            self._min_node = self._min_node.left
+        while self._max_node.right is not None:
+            self._max_node = self._max_node.right
+
+    def find_max(self):
+        """
+        Знаходить найбільше значення в дереві.
+
+        У двійковому дереві пошуку найбільше значення завжди знаходиться
+        в найправішому вузлі дерева. Дерево тримає вказівник на цей вузол
+        і оновлює його при вставці та видаленні, тому запит займає O(1).
+
+        Returns:
+            int/float: Найбільше значення в дереві або None, якщо дерево порожнє
+        """
+        if self._max_node is None:
+            return None
+        return self._max_node.key
+
+    def find_min(self):
+        """
+        Знаходить найменше значення в дереві.
+
+        У двійковому дереві пошуку найменше значення завжди знаходиться
+        в найлівішому вузлі дерева. Дерево тримає вказівник на цей вузол
+        і оновлює його при вставці та видаленні, тому запит займає O(1).
+
+        Returns:
+            int/float: Найменше значення в дереві або None, якщо дерево порожнє
+        """
+        if self._min_node is None:
+            return None
+        return self._min_node.key
+
+    def find_min_max(self):
+        """
+        Повертає пару (мінімум, максимум) за одне звернення.
+
+        Returns:
+            tuple: (min_value, max_value) або (None, None) для порожнього дерева
+        """
+        if self.root is None:
+            return None, None
+        return self._min_node.key, self._max_node.key
+
+    def sum_values(self):
+        """
+        Знаходить суму всіх значень в дереві.
+
+        Сума підтримується в корені як доповнення піддерева, тому запит O(1).
+
+        Returns:
+            int/float: Сума всіх значень в дереві або 0, якщо дерево порожнє
+        """
+        return _total(self.root)
+
+    def count_nodes(self):
+        """Підраховує кількість вузлів у дереві за O(1) з розміру кореня"""
+        return _size(self.root)
+
+    def average_value(self):
+        """Обчислює середнє арифметичне значення всіх вузлів"""
+        total_sum = self.sum_values()
+        node_count = self.count_nodes()
+
+        if node_count == 0:
+            return 0
+
+        return total_sum / node_count
+
+    def sum_range(self, lo, hi):
+        """
+        Сума ключів з діапазону lo <= key <= hi за O(h).
+
+        Повторний запит того самого діапазону між змінами дерева - O(1) з кешу.
+
+        Returns:
+            int/float: Сума або 0, якщо в діапазоні немає ключів
+        """
+        return self._cached(self._range_aggregate, lo, hi)[1]
+
+    def count_range(self, lo, hi):
+        """
+        Кількість ключів з діапазону lo <= key <= hi за O(h).
+
+        Returns:
+            int: Кількість ключів у діапазоні
+        """
+        return self._cached(self._range_aggregate, lo, hi)[0]
+
+    def _cached(self, query, *args):
+        """
+        Повертає результат запиту з LRU-кешу поточної версії дерева.
+
+        Кеш очищується при першому зверненні після зміни дерева, тож між
+        змінами повторний запит з тими самими аргументами коштує O(1), а
+        кількість збережених результатів обмежена query_cache_size.
+
+        Args:
+            query: Метод дерева, що лише читає
+            *args: Хешовані аргументи запиту
+        """
+        if self.query_cache_size <= 0:
+            return query(*args)
+
+        cache = self._query_cache
+        version = self.version
+        if self._cache_version != version:
+            cache.clear()
+            self._cache_version = version
+
+        # Версія входить у ключ: результат, обчислений під час зміни з
+        # іншого потоку, ніколи не збігеться з версією після неї
+        key = (version, query.__name__, args)
+        result = cache.get(key, _MISSING)
+        if result is not _MISSING:
+            try:
+                cache.move_to_end(key)
+            except KeyError:
+                pass  # Інший читач щойно очистив кеш
+            return result
+
+        result = query(*args)
+        cache[key] = result
+        try:
+            while len(cache) > self.query_cache_size:
+                cache.popitem(last=False)
+        except KeyError:
+            pass
+        return result
+
+    def _range_aggregate(self, lo, hi):
+        """
+        Рахує (кількість, суму) ключів діапазону [lo, hi] за доповненнями піддерев.
+
+        Спочатку знаходимо вузол розгалуження, де шляхи до lo та hi розходяться,
+        далі спускаємося по двох межах: кожне піддерево, що цілком потрапляє в
+        діапазон, додається одним зверненням до size/total.
+        """
+        node = self.root
+        while node is not None and not (lo <= node.key <= hi):
+            node = node.left if hi < node.key else node.right
+
+        if node is None:
+            return 0, 0
+
+        count = node.count
+        total = node.key * node.count
+
+        # Ліва межа: ключі >= lo у лівому піддереві вузла розгалуження
+        current = node.left
+        while current is not None:
+            if current.key >= lo:
+                count += current.count + _size(current.right)
+                total += current.key * current.count + _total(current.right)
+                current = current.left
+            else:
+                current = current.right
+
+        # Права межа: ключі <= hi у правому піддереві вузла розгалуження
+        current = node.right
+        while current is not None:
+            if current.key <= hi:
+                count += current.count + _size(current.left)
+                total += current.key * current.count + _total(current.left)
+                current = current.right
+            else:
+                current = current.left
+
+        return count, total
+
+    def search(self, key):
+        """
+        Шукає вузол із заданим ключем за O(h).
+
+        Повернений вузол - живий вузол дерева, а не копія: він дійсний лише
+        до наступної зміни. Видалення може перенести в нього ключ наступника
+        або повернути його в пул, звідки наступна вставка візьме його з
+        іншим ключем. Щоб зберегти значення, беріть node.key одразу, а для
+        перевірки належності використовуйте contains.
+
+        Returns:
+            Node: Знайдений вузол або None
+        """
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def contains(self, key):
+        """Перевіряє, чи є ключ у дереві"""
+        return self.search(key) is not None
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def contains_many(self, keys):
+        """
+        Перевіряє належність багатьох ключів за один узгоджений прохід.
+
+        Проби сортуються один раз, після чого дерево проходиться лінивим
+        iter_range від найменшої до найбільшої проби разом зі списком
+        проб, як при злитті: O(n + m log m) замість m окремих спусків.
+        Для малого набору проб (m * log2(n) < n) окремі спуски дешевші
+        і використовуються вони.
+
+        Args:
+            keys: Ключі для перевірки
+
+        Returns:
+            list: Булеві значення у порядку вхідних ключів
+        """
+        probes = list(keys)
+        if not probes:
+            return []
+
+        if self._prefers_descents(len(probes)):
+            return [self.search(key) is not None for key in probes]
+
+        order = sorted(range(len(probes)), key=probes.__getitem__)
+        result = [False] * len(probes)
+
+        # Спуск до найменшої проби за O(h), далі спільний рух вперед
+        values = self.iter_range(probes[order[0]], probes[order[-1]])
+        current = next(values, _MISSING)
+        for index in order:
+            key = probes[index]
+            while current is not _MISSING and current < key:
+                current = next(values, _MISSING)
+            if current is _MISSING:
+                break
+            result[index] = current == key
+
+        return result
+
+    def search_many(self, keys):
+        """
+        Повертає ключі з keys, присутні в дереві, у порядку вхідних ключів.
+
+        Використовує той самий узгоджений прохід, що й contains_many.
+        """
+        probes = list(keys)
+        return [key for key, found in zip(probes, self.contains_many(probes)) if found]
+
+    def select(self, k):
+        """
+        Повертає k-те найменше значення (k від 0) за O(h) через розміри піддерев.
+
+        Raises:
+            IndexError: Якщо k поза межами [0, count_nodes())
+        """
+        if not 0 <= k < self.count_nodes():
+            raise IndexError("Індекс k поза межами дерева")
+
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k < left_size + node.count:
+                return node.key
+            else:
+                k -= left_size + node.count
+                node = node.right
+
+    def rank(self, key):
+        """
+        Повертає кількість значень, строго менших за key, за O(h).
+
+        Для наявного ключа це індекс його першого входження у display_inorder().
+        """
+        rank = 0
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                rank += _size(node.left) + node.count
+                node = node.right
+            else:
+                return rank + _size(node.left)
+        return rank
+
+    def percentile(self, p):
+        """
+        Повертає p-й процентиль (0 <= p <= 100) з лінійною інтерполяцією.
+
+        Використовує не більше двох викликів select, тобто O(h); повторний
+        запит між змінами дерева береться з кешу.
+
+        Returns:
+            int/float: Значення процентиля або None, якщо дерево порожнє
+
+        Raises:
+            ValueError: Якщо p поза межами [0, 100]
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("Процентиль має бути в межах [0, 100]")
+
+        return self._cached(self._interpolate_percentile, p)
+
+    def _interpolate_percentile(self, p):
+        """Обчислює процентиль без кешу (див. percentile)"""
+        count = self.count_nodes()
+        if count == 0:
+            return None
+
+        position = (count - 1) * p / 100
+        lower = int(position)
+        fraction = position - lower
+        lower_value = self.select(lower)
+        if fraction == 0:
+            return lower_value
+
+        upper_value = self.select(lower + 1)
+        return lower_value + (upper_value - lower_value) * fraction
+
+    def display_inorder(self):
+        """Виводить дерево в порядку зростання (in-order traversal)"""
+        return list(self.iter_range())
+
+    def __iter__(self):
+        """Ітерує значення в порядку зростання"""
+        return self.iter_range()
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Лінивий генератор значень з діапазону lo <= key <= hi.
+
+        Спуск до першої межі займає O(h), далі кожне значення видається
+        за амортизовану O(1) з явним стеком розміром O(h), тому перші k
+        значень коштують O(h + k) без побудови повного списку. Дерево не
+        можна змінювати, поки генератор не вичерпано.
+
+        Args:
+            lo: Нижня межа (включно) або None для необмеженої
+            hi: Верхня межа (включно) або None для необмеженої
+            reverse (bool): Видавати значення в порядку спадання
+
+        Yields:
+            int/float: Значення в порядку зростання (або спадання)
+        """
+        stack = []
+        node = self.root
+
+        if not reverse:
+            # Відкладаємо предків з key >= lo: це кандидати на перше значення
+            while node is not None:
+                if lo is not None and node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+
+            while stack:
+                node = stack.pop()
+                if hi is not None and node.key > hi:
+                    return
+                yield node.key
+                if node.count > 1:
+                    yield from repeat(node.key, node.count - 1)
+                node = node.right
+                while node is not None:
+                    stack.append(node)
+                    node = node.left
+        else:
+            # Дзеркально: відкладаємо предків з key <= hi
+            while node is not None:
+                if hi is not None and node.key > hi:
+                    node = node.left
+                else:
+                    stack.append(node)
+                    node = node.right
+
+            while stack:
+                node = stack.pop()
+                if lo is not None and node.key < lo:
+                    return
+                yield node.key
+                if node.count > 1:
+                    yield from repeat(node.key, node.count - 1)
+                node = node.left
+                while node is not None:
+                    stack.append(node)
+                    node = node.right
+
+    def _replace_child(self, parent, old, new):
+        """Підміняє дитину old вузла parent на new (або корінь, якщо parent None)"""
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _rebalance_path(self, path):
+        """Оновлює доповнення та балансує вузли шляху знизу вгору"""
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            balanced = self._rebalance(node)
+            if balanced is not node:
+                self._replace_child(path[i - 1] if i > 0 else None, node, balanced)
+
+    def _rebalance(self, node):
+        """
+        Оновлює доповнення вузла; звичайне дерево не виконує поворотів.
+
+        Returns:
+            Node: Корінь піддерева після балансування
+        """
+        self._update(node)
+        return node
+
+    def _update(self, node):
+        """Перераховує висоту, розмір та суму піддерева за дітьми"""
+        left, right = node.left, node.right
+        node.height = 1 + max(_height(left), _height(right))
+        node.size = node.count + _size(left) + _size(right)
+        node.total = node.key * node.count + _total(left) + _total(right)
+
+    def height(self):
+        """Висота дерева (0 для порожнього)"""
+        return _height(self.root)
+
+    def shape_report(self):
+        """
+        Діагностика форми дерева за один ітеративний прохід.
+
+        Балансові фактори беруться з висот, що зберігаються у вузлах, тож
+        кожен вузол відвідується рівно один раз. Глибина рахується у
+        вузлах шляху (корінь - 1), як і кількість відвіданих вузлів пошуку.
+
+        Returns:
+            dict: 'nodes' - кількість вузлів; 'height' та 'optimal_height'
+                (ceil(log2(n + 1))) з їх відношенням 'height_ratio';
+                'levels' - кількість вузлів на кожному рівні;
+                'balance_factors' - розподіл висота(ліве) - висота(праве);
+                'left_heavy' / 'right_heavy' - вузли з |фактором| > 1;
+                'average_path_length' - середня глибина вузла та
+                'optimal_path_length' - та сама величина для ідеального дерева
+        """
+        levels = []
+        balance_factors = {}
+        left_heavy = right_heavy = path_length = 0
+
+        stack = [(self.root, 1)] if self.root is not None else []
+        while stack:
+            node, depth = stack.pop()
+            if depth > len(levels):
+                levels.append(0)
+            levels[depth - 1] += 1
+            path_length += depth
+
+            factor = _height(node.left) - _height(node.right)
+            balance_factors[factor] = balance_factors.get(factor, 0) + 1
+            if factor > 1:
+                left_heavy += 1
+            elif factor < -1:
+                right_heavy += 1
+
+            if node.right is not None:
+                stack.append((node.right, depth + 1))
+            if node.left is not None:
+                stack.append((node.left, depth + 1))
+
+        nodes = sum(levels)
+        height = len(levels)
+        optimal = math.ceil(math.log2(nodes + 1))
+        # В ідеальному дереві рівень d (з 1) заповнений 2 ** (d - 1) вузлами
+        optimal_path, remaining, depth = 0, nodes, 1
+        while remaining:
+            filled = min(remaining, 1 << (depth - 1))
+            optimal_path += filled * depth
+            remaining -= filled
+            depth += 1
+
+        return {
+            'nodes': nodes,
+            'height': height,
+            'optimal_height': optimal,
+            'height_ratio': height / optimal if optimal else 1.0,
+            'levels': levels,
+            'balance_factors': dict(sorted(balance_factors.items())),
+            'left_heavy': left_heavy,
+            'right_heavy': right_heavy,
+            'average_path_length': path_length / nodes if nodes else 0.0,
+            'optimal_path_length': optimal_path / nodes if nodes else 0.0,
+        }
+
+    def _rotate_left(self, node):
+        """Лівий поворот навколо node зі збереженням доповнень"""
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        """Правий поворот навколо node зі збереженням доповнень"""
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+class AVLTree(BinarySearchTree):
+    """
+    Самобалансоване AVL-дерево.
+
+    Кожен вузол зберігає висоту свого піддерева, а після вставки чи
+    видалення дерево відновлює баланс поворотами. Висота дерева завжди
+    O(log n), тому пошук, find_max та find_min не деградують навіть
+    при вставці відсортованих даних.
+    """
+    # Баланс підтримується поворотами, перебудова піддерев не потрібна
+    rebuild_factor = None
+    self_balancing = True
+
+    def _rebalance(self, node):
+        """
+        Відновлює баланс вузла.
+
+        Returns:
+            Node: Новий корінь піддерева
+        """
+        self._update(node)
+        balance = _height(node.left) - _height(node.right)
+
+        if balance > 1:
+            # Ліве піддерево вище: випадок LR зводимо до LL
+            if _height(node.left.left) < _height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+
+        if balance < -1:
+            # Праве піддерево вище: випадок RL зводимо до RR
+            if _height(node.right.right) < _height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+
+        return node
@@ -0,0 +1,414 @@
+"""
+B+-дерево на диску для наборів ключів, більших за оперативну пам'ять
+
+Реалізація включає:
+- Клас Pager: файл сторінок фіксованого розміру та буферний пул з
+  витісненням найдавніше використаних сторінок (LRU)
+- Клас BTree: B+-дерево з тим самим інтерфейсом, що й BinarySearchTree
+  (insert, find_min, find_max, sum_values, обхід у порядку зростання)
+
+Сторінка 0 - метадані (коренева сторінка, крайні листки, кількість і сума
+ключів), решта - вузли дерева. Внутрішні вузли зберігають лише
+розділювачі та номери дочірніх сторінок, ключі лежать у листках, зв'язаних
+у список для послідовного обходу. При сторінці 4 КБ у листку до 511
+ключів, тож операція читає O(log_B n) сторінок, а в пам'яті тримається
+лише буферний пул.
+"""
+
+import operator
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+MAGIC = b'BTR1'
+PAGE_SIZE = 4096
+# Кількість ключів у заголовку вузла 16-бітна (до 65535), а листок на
+# найбільшій сторінці вміщає близько 32 тисяч ключів - із запасом
+MAX_PAGE_SIZE = 256 * 1024
+
+# Метадані: сигнатура, розмір сторінки, тип ключів, корінь, перший листок,
+# останній листок, кількість сторінок, кількість ключів; сума - окремо
+_META = struct.Struct('<4sIc3xiiiiq')
+_SUM_OFFSET = _META.size
+# Заголовок вузла: листок, кількість ключів, наступний листок
+_NODE = struct.Struct('<BxHi')
+
+_NONE = -1
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+class _Page:
+    """Розкодована сторінка-вузол у буферному пулі"""
+    __slots__ = ('number', 'leaf', 'keys', 'children', 'next', 'dirty')
+
+    def __init__(self, number, leaf, keys=None, children=None, next_leaf=_NONE):
+        self.number = number
+        self.leaf = leaf
+        self.keys = keys if keys is not None else []
+        # Номери дочірніх сторінок (лише для внутрішніх вузлів)
+        self.children = children if children is not None else []
+        # Наступний листок у порядку ключів (лише для листків)
+        self.next = next_leaf
+        self.dirty = False
+
+class Pager:
+    """
+    Файл сторінок з буферним пулом LRU.
+
+    Args:
+        path (str): Шлях до файлу сторінок
+        page_size (int): Розмір сторінки в байтах
+        typecode (str): Тип ключів: 'd' (float64) або 'q' (int64)
+        cache_pages (int): Скільки розкодованих сторінок тримати в пам'яті
+    """
+
+    def __init__(self, path, page_size, typecode, cache_pages):
+        self.page_size = page_size
+        self.typecode = typecode
+        self.cache_pages = cache_pages
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        self._cache = OrderedDict()
+        self.page_count = 1  # Сторінка 0 - метадані
+        # Лічильники звернень до диска для вимірювань
+        self.reads = 0
+        self.writes = 0
+
+    def read_raw(self, number):
+        """Сирі байти сторінки з файлу (без кешування)"""
+        self._file.seek(number * self.page_size)
+        return self._file.read(self.page_size)
+
+    def write_raw(self, number, data):
+        """Записує сирі байти сторінки у файл"""
+        self._file.seek(number * self.page_size)
+        self._file.write(data)
+
+    def get(self, number):
+        """Сторінка з буферного пулу; промах читає та розкодовує її з файлу"""
+        page = self._cache.get(number)
+        if page is not None:
+            self._cache.move_to_end(number)
+            return page
+
+        page = self._decode(number, self.read_raw(number))
+        self.reads += 1
+        self._put(page)
+        return page
+
+    def allocate(self, leaf):
+        """Нова порожня сторінка в кінці файлу"""
+        page = _Page(self.page_count, leaf)
+        self.page_count += 1
+        self.mark_dirty(page)
+        return page
+
+    def mark_dirty(self, page):
+        """
+        Позначає сторінку зміненою.
+
+        Сторінка, витіснена, поки викликач ще тримав на неї посилання,
+        повертається в пул, щоб зміни не загубилися.
+        """
+        page.dirty = True
+        if self._cache.get(page.number) is not page:
+            self._put(page)
+        else:
+            self._cache.move_to_end(page.number)
+
+    def _put(self, page):
+        """Додає сторінку в пул, витісняючи найдавніше використані"""
+        self._cache[page.number] = page
+        self._cache.move_to_end(page.number)
+        while len(self._cache) > self.cache_pages:
+            _, evicted = self._cache.popitem(last=False)
+            if evicted.dirty:
+                self._write(evicted)
+
+    def _write(self, page):
+        """Кодує та записує сторінку у файл"""
+        count = len(page.keys)
+        data = bytearray(self.page_size)
+        _NODE.pack_into(data, 0, page.leaf, count, page.next)
+        struct.pack_into(f'<{count}{self.typecode}', data, _NODE.size, *page.keys)
+        if not page.leaf:
+            struct.pack_into(f'<{count + 1}i', data, _NODE.size + 8 * count, *page.children)
+        self.write_raw(page.number, data)
+        self.writes += 1
+        page.dirty = False
+
+    def _decode(self, number, data):
+        """Розкодовує сторінку-вузол з сирих байтів"""
+        leaf, count, next_leaf = _NODE.unpack_from(data, 0)
+        keys = list(struct.unpack_from(f'<{count}{self.typecode}', data, _NODE.size))
+        children = None
+        if not leaf:
+            children = list(struct.unpack_from(f'<{count + 1}i', data, _NODE.size + 8 * count))
+        return _Page(number, bool(leaf), keys, children, next_leaf)
+
+    def flush(self):
+        """Записує всі змінені сторінки пулу у файл"""
+        for page in self._cache.values():
+            if page.dirty:
+                self._write(page)
+        self._file.flush()
+
+    def close(self):
+        """Записує змінені сторінки та закриває файл"""
+        self.flush()
+        self._file.close()
+
+class BTree:
+    """
+    B+-дерево у файлі сторінок з інтерфейсом BinarySearchTree.
+
+    Якщо файл уже існує, дерево відкривається з нього (тип ключів і розмір
+    сторінки беруться з метаданих), інакше створюється порожнє. Зміни
+    потрапляють на диск при витісненні сторінок, flush() та close().
+
+    Args:
+        path (str): Шлях до файлу сторінок
+        typecode (str): Тип ключів нового дерева: 'd' (float) або 'q' (int)
+        page_size (int): Розмір сторінки нового дерева в байтах (до MAX_PAGE_SIZE)
+        cache_pages (int): Розмір буферного пулу в сторінках
+
+    Використання:
+        with BTree('keys.db') as tree:
+            tree.insert(42)
+    """
+
+    def __init__(self, path, typecode='d', page_size=PAGE_SIZE, cache_pages=256):
+        if typecode not in ('d', 'q'):
+            raise ValueError("Підтримуються лише типи ключів 'd' та 'q'")
+        if not 64 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"Розмір сторінки має бути від 64 до {MAX_PAGE_SIZE} байтів")
+        if cache_pages < 8:
+            raise ValueError("Буферний пул має вміщати хоча б 8 сторінок")
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, 'rb') as file:
+                meta = file.read(_SUM_OFFSET + 8)
+            magic, page_size, typecode, *_ = _META.unpack_from(meta, 0)
+            if magic != MAGIC:
+                raise ValueError("Файл не містить B-дерева (неправильна сигнатура)")
+            typecode = typecode.decode()
+
+        self._pager = Pager(path, page_size, typecode, cache_pages)
+        # Максимальна кількість ключів у листку та внутрішньому вузлі
+        self._leaf_capacity = (page_size - _NODE.size) // 8
+        self._inner_capacity = (page_size - _NODE.size - 4) // 12
+
+        if exists:
+            self._read_meta()
+        else:
+            self._root = self._pager.allocate(leaf=True).number
+            self._first_leaf = self._last_leaf = self._root
+            self._count = 0
+            self._total = 0
+            self._write_meta()
+
+    def _read_meta(self):
+        """Завантажує метадані зі сторінки 0"""
+        meta = self._pager.read_raw(0)
+        (_, _, _, self._root, self._first_leaf, self._last_leaf,
+         self._pager.page_count, self._count) = _META.unpack_from(meta, 0)
+        (self._total,) = struct.unpack_from('<' + self._pager.typecode, meta, _SUM_OFFSET)
+
+    def _write_meta(self):
+        """Записує метадані на сторінку 0"""
+        pager = self._pager
+        meta = bytearray(pager.page_size)
+        _META.pack_into(meta, 0, MAGIC, pager.page_size, pager.typecode.encode(),
+                        self._root, self._first_leaf, self._last_leaf,
+                        pager.page_count, self._count)
+        struct.pack_into('<' + pager.typecode, meta, _SUM_OFFSET, self._total)
+        pager.write_raw(0, meta)
+
+    def flush(self):
+        """Записує всі зміни на диск"""
+        self._pager.flush()
+        self._write_meta()
+
+    def close(self):
+        """Записує зміни та закриває файл"""
+        # Спершу сторінки, потім метадані: метадані не мають посилатися на
+        # сторінки, яких немає у файлі
+        self.flush()
+        self._pager.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def page_reads(self):
+        """Кількість сторінок, прочитаних з диска (промахів буферного пулу)"""
+        return self._pager.reads
+
+    def insert(self, key):
+        """
+        Вставка нового значення (дублікати не вставляються).
+
+        Спуск читає одну сторінку на рівень; переповнений вузол ділиться
+        навпіл, а розділювач піднімається до батька, тож дерево росте вгору
+        і завжди лишається ідеально збалансованим за висотою.
+
+        Raises:
+            TypeError: Якщо ключ дерева типу 'q' не ціле число
+            ValueError: Якщо ключ або сума ключів дерева типу 'q' не
+                вміщається в int64
+        """
+        pager = self._pager
+        if pager.typecode == 'd':
+            key = float(key)
+        else:
+            # Перевіряємо до будь-яких змін: інакше помилка з'явилася б лише
+            # під час запису сторінки чи метаданих
+            try:
+                key = operator.index(key)
+            except TypeError:
+                raise TypeError("Ключі дерева типу 'q' мають бути цілими числами") from None
+            if not _INT64_MIN <= key <= _INT64_MAX:
+                raise ValueError("Ключ не вміщається в int64")
+
+        # Шлях: (внутрішня сторінка, індекс дитини, в яку спустилися)
+        path = []
+        page = pager.get(self._root)
+        while not page.leaf:
+            index = bisect_right(page.keys, key)
+            path.append((page, index))
+            page = pager.get(page.children[index])
+
+        position = bisect_left(page.keys, key)
+        if position < len(page.keys) and page.keys[position] == key:
+            return  # Дублікат не вставляємо
+        if pager.typecode == 'q' and not _INT64_MIN <= self._total + key <= _INT64_MAX:
+            raise ValueError("Сума ключів не вміщається в int64")
+
+        page.keys.insert(position, key)
+        pager.mark_dirty(page)
+        self._count += 1
+        self._total += key
+
+        if len(page.keys) <= self._leaf_capacity:
+            return
+
+        # Ділимо листок: права половина переходить на нову сторінку
+        middle = len(page.keys) // 2
+        right = pager.allocate(leaf=True)
+        right.keys = page.keys[middle:]
+        del page.keys[middle:]
+        right.next = page.next
+        page.next = right.number
+        pager.mark_dirty(page)
+        if self._last_leaf == page.number:
+            self._last_leaf = right.number
+        separator = right.keys[0]
+
+        while path:
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.children.insert(index + 1, right.number)
+            pager.mark_dirty(parent)
+            if len(parent.keys) <= self._inner_capacity:
+                return
+
+            # Ділимо внутрішній вузол: середній розділювач іде до батька
+            middle = len(parent.keys) // 2
+            separator = parent.keys[middle]
+            right = pager.allocate(leaf=False)
+            right.keys = parent.keys[middle + 1:]
+            right.children = parent.children[middle + 1:]
+            del parent.keys[middle:]
+            del parent.children[middle + 1:]
+            pager.mark_dirty(parent)
+            page = parent
+
+        # Поділився корінь: дерево виростає на рівень
+        root = pager.allocate(leaf=False)
+        root.keys = [separator]
+        root.children = [page.number, right.number]
+        self._root = root.number
+
+    def contains(self, key):
+        """Перевіряє, чи є ключ у дереві, читаючи одну сторінку на рівень"""
+        page = self._pager.get(self._root)
+        while not page.leaf:
+            page = self._pager.get(page.children[bisect_right(page.keys, key)])
+        position = bisect_left(page.keys, key)
+        return position < len(page.keys) and page.keys[position] == key
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def find_max(self):
+        """Найбільше значення (останній ключ останнього листка) або None"""
+        if self._count == 0:
+            return None
+        return self._pager.get(self._last_leaf).keys[-1]
+
+    def find_min(self):
+        """Найменше значення (перший ключ першого листка) або None"""
+        if self._count == 0:
+            return None
+        return self._pager.get(self._first_leaf).keys[0]
+
+    def sum_values(self):
+        """Сума всіх значень з метаданих за O(1)"""
+        return self._total
+
+    def count_nodes(self):
+        """Кількість значень у дереві"""
+        return self._count
+
+    def average_value(self):
+        """Середнє арифметичне значення або 0 для порожнього дерева"""
+        if self._count == 0:
+            return 0
+        return self._total / self._count
+
+    def height(self):
+        """Кількість рівнів дерева (сторінок на шляху від кореня до листка)"""
+        levels = 1
+        page = self._pager.get(self._root)
+        while not page.leaf:
+            page = self._pager.get(page.children[0])
+            levels += 1
+        return levels
+
+    def iter_range(self, lo=None, hi=None):
+        """
+        Ліниво видає значення з діапазону [lo, hi] у порядку зростання.
+
+        Спуск до першого листка діапазону - O(log_B n) сторінок, далі
+        листки читаються послідовно за ланцюжком next.
+        """
+        pager = self._pager
+        if lo is None:
+            page, position = pager.get(self._first_leaf), 0
+        else:
+            page = pager.get(self._root)
+            while not page.leaf:
+                page = pager.get(page.children[bisect_right(page.keys, lo)])
+            position = bisect_left(page.keys, lo)
+
+        while True:
+            for key in page.keys[position:]:
+                if hi is not None and key > hi:
+                    return
+                yield key
+            if page.next == _NONE:
+                return
+            page, position = pager.get(page.next), 0
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def display_inorder(self):
+        """Значення в порядку зростання"""
+        return list(self)
@@ -0,0 +1,255 @@
+"""
+Потокобезпечне дерево пошуку з блокуванням читання-запису та оптимістичним читанням
+
+Реалізація включає:
+- Клас ReadWriteLock: багато читачів або один писач, з пріоритетом писачів
+- Клас ConcurrentBinarySearchTree: обгортка над AVLTree (або іншим
+  BinarySearchTree), безпечна для одночасного використання з багатьох потоків
+
+Записи виконуються під блокуванням писача і обрамлюються лічильником
+послідовності (seqlock): непарне значення означає, що запис триває.
+Короткі запити (find_max, sum_values, contains, select, ...) спершу
+виконуються оптимістично без блокувань і приймаються, лише якщо лічильник
+не змінився; інакше запит повторюється, а після кількох невдалих спроб
+виконується під блокуванням читача. Довгі обходи (display_inorder,
+contains_many) одразу беруть блокування читача, тож не заважають одне
+одному, а лише писачам.
+
+Дерева, читання яких змінює їхню форму (reads_mutate, наприклад
+SplayTree), не можна читати паралельно: для них усі запити виконуються
+під блокуванням писача.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from bst import AVLTree
+
+class ReadWriteLock:
+    """Блокування читання-запису: читачі не блокують одне одного"""
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        """Захоплює блокування читача; нові читачі чекають, поки є писачі в черзі"""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        """Звільняє блокування читача"""
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        """Захоплює виключне блокування писача"""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        """Звільняє блокування писача"""
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """Контекстний менеджер для блокування читача"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """Контекстний менеджер для блокування писача"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+class ConcurrentBinarySearchTree:
+    """
+    Потокобезпечне дерево з інтерфейсом BinarySearchTree.
+
+    Args:
+        tree (BinarySearchTree): Дерево, яке треба захистити (за замовчуванням
+            нове AVLTree); після передачі його не можна використовувати напряму.
+            Якщо tree.reads_mutate, запити на читання виконуються по одному
+            під блокуванням писача
+    """
+    # Скільки разів повторювати оптимістичне читання перед блокуванням
+    optimistic_retries = 3
+
+    def __init__(self, tree=None):
+        self._tree = tree if tree is not None else AVLTree()
+        self._lock = ReadWriteLock()
+        # Лічильник послідовності: непарний, поки триває запис
+        self._sequence = 0
+        # Читання, що змінює дерево, не можна виконувати оптимістично
+        # чи паралельно з іншими читачами
+        self._exclusive_reads = self._tree.reads_mutate
+
+    def _write(self, mutate, *args):
+        """Виконує зміну під блокуванням писача, обрамлюючи її лічильником"""
+        with self._lock.write_locked():
+            self._sequence += 1
+            version = self._tree.version
+            try:
+                return mutate(*args)
+            finally:
+                # Друге збільшення версії робить недійсними результати, які
+                # оптимістичні читачі закешували посеред запису
+                if self._tree.version != version:
+                    self._tree.version += 1
+                self._sequence += 1
+
+    def _read(self, query, *args):
+        """
+        Виконує короткий запит оптимістично, з відкатом на блокування читача.
+
+        Результат приймається, лише якщо під час запиту не почався і не
+        завершився жоден запис. Виняток під час такого запиту може бути
+        наслідком читання напівзміненої структури, тому він вважається
+        справжнім лише тоді, коли лічильник теж не змінився.
+        """
+        if self._exclusive_reads:
+            return self._read_exclusive(query, *args)
+
+        for _ in range(self.optimistic_retries):
+            before = self._sequence
+            if before & 1:
+                continue  # Запис триває, пробуємо ще раз
+
+            try:
+                result = query(*args)
+            except Exception:
+                if self._sequence == before:
+                    raise
+                continue
+
+            if self._sequence == before:
+                return result
+
+        with self._lock.read_locked():
+            return query(*args)
+
+    def _read_locked(self, query, *args):
+        """Виконує довгий запит під блокуванням читача"""
+        if self._exclusive_reads:
+            return self._read_exclusive(query, *args)
+
+        with self._lock.read_locked():
+            return query(*args)
+
+    def _read_exclusive(self, query, *args):
+        """
+        Виконує запит до дерева з reads_mutate під блокуванням писача.
+
+        Запит змінює лише форму дерева, а не вміст, тож лічильник
+        послідовності та версія дерева не змінюються.
+        """
+        with self._lock.write_locked():
+            return query(*args)
+
+    # Зміни
+
+    def insert(self, key):
+        """Вставка нового значення"""
+        self._write(self._tree.insert, key)
+
+    def insert_many(self, iterable):
+        """Пакетна вставка значень одним записом"""
+        self._write(self._tree.insert_many, list(iterable))
+
+    def delete(self, key):
+        """Видаляє значення; повертає True, якщо воно було в дереві"""
+        return self._write(self._tree.delete, key)
+
+    def pop_min(self):
+        """Видаляє та повертає найменше значення"""
+        return self._write(self._tree.pop_min)
+
+    def pop_max(self):
+        """Видаляє та повертає найбільше значення"""
+        return self._write(self._tree.pop_max)
+
+    # Короткі запити (оптимістичні)
+
+    def find_max(self):
+        """Найбільше значення або None"""
+        return self._read(self._tree.find_max)
+
+    def find_min(self):
+        """Найменше значення або None"""
+        return self._read(self._tree.find_min)
+
+    def find_min_max(self):
+        """Пара (мінімум, максимум) з одного узгодженого стану"""
+        return self._read(self._tree.find_min_max)
+
+    def sum_values(self):
+        """Сума всіх значень"""
+        return self._read(self._tree.sum_values)
+
+    def count_nodes(self):
+        """Кількість значень"""
+        return self._read(self._tree.count_nodes)
+
+    def average_value(self):
+        """Середнє арифметичне значення"""
+        return self._read(self._tree.average_value)
+
+    def contains(self, key):
+        """Перевіряє, чи є ключ у дереві"""
+        return self._read(self._tree.contains, key)
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def sum_range(self, lo, hi):
+        """Сума ключів з діапазону [lo, hi]"""
+        return self._read(self._tree.sum_range, lo, hi)
+
+    def count_range(self, lo, hi):
+        """Кількість ключів з діапазону [lo, hi]"""
+        return self._read(self._tree.count_range, lo, hi)
+
+    def select(self, k):
+        """k-те найменше значення (k від 0)"""
+        return self._read(self._tree.select, k)
+
+    def rank(self, key):
+        """Кількість значень, менших за key"""
+        return self._read(self._tree.rank, key)
+
+    def percentile(self, p):
+        """p-й процентиль значень"""
+        return self._read(self._tree.percentile, p)
+
+    # Довгі запити (під блокуванням читача)
+
+    def display_inorder(self):
+        """Значення в порядку зростання"""
+        return self._read_locked(self._tree.display_inorder)
+
+    def contains_many(self, keys):
+        """Пакетна перевірка належності ключів"""
+        return self._read_locked(self._tree.contains_many, list(keys))
+
+    def search_many(self, keys):
+        """Ключі з keys, присутні в дереві"""
+        return self._read_locked(self._tree.search_many, list(keys))
@@ -0,0 +1,423 @@
+"""
+Інструментування гарячих шляхів дерева пошуку
+
+Лічильники вмикаються для окремого дерева: instrument(tree) (або
+tree.enable_instrumentation()) підміняє клас екземпляра на підклас, який
+рахує порівняння ключів, відвідані вузли, глибину спуску, повороти,
+виділення вузлів та перебудови піддерев для кожної операції. Рахуються
+справжні спуски: ключ операції загортається в об'єкт, що враховує кожне
+своє порівняння з ключем вузла, тож дерево не обходиться вдруге, а
+кількість порівнянь точно відповідає коду стратегії (зокрема SplayTree).
+Сам клас дерева не змінюється, тож вимкнені лічильники нічого не коштують:
+uninstrument(tree) повертає екземпляру його клас.
+
+Знімок метрик доступний як словник (TreeMetrics.snapshot) або як текст у
+форматі Prometheus (TreeMetrics.to_prometheus) - зокрема з відношенням
+висоти дерева до оптимальної для сповіщень про виродження.
+"""
+
+import math
+import operator
+from functools import wraps
+
+_MISSING = object()
+
+# Операції з пошуком ключа: кожен виклик - один спуск від кореня
+_KEYED_OPERATIONS = ('insert', 'delete', 'search')
+# Операції зі спуском по краю дерева
+_EDGE_OPERATIONS = ('pop_min', 'pop_max')
+# Пакетні операції: порівнюються всі ключі пакета
+_BATCH_OPERATIONS = ('insert_many', 'contains_many')
+# Решта публічних запитів рахується лише за кількістю викликів
+_COUNTED_OPERATIONS = (
+    'search_many', 'find_min', 'find_max', 'sum_values', 'count_nodes',
+    'sum_range', 'count_range', 'select', 'rank', 'percentile', 'split',
+)
+# Внутрішні методи, виклики яких приписуються поточній операції
+_EVENTS = {
+    '_rotate_left': 'rotations',
+    '_rotate_right': 'rotations',
+    '_rebuild_subtree': 'rebuilds',
+}
+
+_FIELDS = (
+    'calls', 'comparisons', 'nodes_visited', 'descents', 'max_depth',
+    'total_depth', 'rotations', 'allocations', 'pool_reuses', 'rebuilds',
+)
+
+# Підкласи з лічильниками, створені для кожного класу дерева один раз
+_instrumented_classes = {}
+
+def _comparison(compare):
+    """Оператор порівняння _Probe, що враховує порівняння з ключем вузла"""
+    def method(self, other):
+        if type(other) is _Probe:
+            # Ключі пакета порівнюються між собою лише під час сортування
+            return compare(self.value, other.value)
+        self.metrics.compare(other)
+        return compare(self.value, other)
+    return method
+
+class _Probe:
+    """
+    Ключ операції, що рахує свої порівняння з ключами вузлів.
+
+    Порівняння у зворотному порядку (node.key < probe) Python зводить до
+    віддзеркаленого оператора probe, тож враховуються обидва напрямки.
+    У вузли проба не потрапляє: _new_node та _append_sorted її знімають.
+    """
+    __slots__ = ('value', 'metrics')
+
+    def __init__(self, value, metrics):
+        self.value = value
+        self.metrics = metrics
+
+    __lt__ = _comparison(operator.lt)
+    __le__ = _comparison(operator.le)
+    __gt__ = _comparison(operator.gt)
+    __ge__ = _comparison(operator.ge)
+    __eq__ = _comparison(operator.eq)
+    __ne__ = _comparison(operator.ne)
+    __hash__ = None
+
+def _probe(key, metrics):
+    """Загортає ключ у _Probe (вкладені операції отримують уже загорнутий)"""
+    return key if type(key) is _Probe else _Probe(key, metrics)
+
+def _unwrap(key):
+    """Справжній ключ проби, щоб зберегти його у вузлі"""
+    return key.value if type(key) is _Probe else key
+
+class TreeMetrics:
+    """
+    Лічильники операцій одного дерева.
+
+    Args:
+        tree (BinarySearchTree): Дерево, для якого збираються метрики
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.operations = {}
+        # Клас дерева без лічильників: знімок викликає його методи напряму
+        self._tree_class = type(tree)
+        # Операція, якій приписуються повороти, виділення та перебудови
+        self._current = 'other'
+        # Ключ вузла з останнього порівняння: новий ключ означає новий вузол
+        self._last = _MISSING
+        # Чи чекає pop_min/pop_max на шлях до крайнього вузла
+        self._edge = False
+
+    def _stats(self, operation):
+        """Лічильники операції (створюються при першому виклику)"""
+        stats = self.operations.get(operation)
+        if stats is None:
+            stats = self.operations[operation] = dict.fromkeys(_FIELDS, 0)
+        return stats
+
+    def record(self, operation):
+        """Враховує виклик операції та робить її поточною"""
+        self._stats(operation)['calls'] += 1
+        self._current = operation
+
+    def add_cost(self, visited, comparisons, descent=False):
+        """
+        Додає вартість до поточної операції.
+
+        Args:
+            visited (int): Відвідані вузли
+            comparisons (int): Порівняння ключів
+            descent (bool): Чи це один спуск від кореня глибиною visited
+        """
+        stats = self._stats(self._current)
+        stats['comparisons'] += comparisons
+        stats['nodes_visited'] += visited
+        if descent:
+            self._add_descent(stats, visited)
+
+    @staticmethod
+    def _add_descent(stats, depth):
+        """Враховує один спуск від кореня заданої глибини"""
+        stats['descents'] += 1
+        stats['total_depth'] += depth
+        if depth > stats['max_depth']:
+            stats['max_depth'] = depth
+
+    def compare(self, key):
+        """
+        Враховує порівняння ключа операції з ключем вузла.
+
+        Ключі вузлів на одному шляху різні, тож порівняння з іншим ключем,
+        ніж попереднє, означає перехід до наступного вузла.
+        """
+        stats = self._stats(self._current)
+        stats['comparisons'] += 1
+        if key is not self._last:
+            self._last = key
+            stats['nodes_visited'] += 1
+
+    def begin_descent(self):
+        """
+        Починає спуск від кореня.
+
+        Returns:
+            int: Кількість відвіданих вузлів поточної операції до спуску
+        """
+        self._last = _MISSING
+        return self._stats(self._current)['nodes_visited']
+
+    def end_descent(self, start):
+        """Враховує спуск, глибина якого - вузли, відвідані після start"""
+        stats = self._stats(self._current)
+        self._add_descent(stats, stats['nodes_visited'] - start)
+
+    def count(self, field, amount=1):
+        """Додає подію (поворот, виділення, ...) до поточної операції"""
+        self._stats(self._current)[field] += amount
+
+    def reset(self):
+        """Обнуляє всі лічильники"""
+        self.operations.clear()
+
+    def snapshot(self):
+        """
+        Знімок метрик у вигляді словника.
+
+        Returns:
+            dict: 'operations' - лічильники кожної операції із середньою
+                глибиною спуску 'mean_depth'; 'totals' - суми за всіма операціями;
+                'tree' - розмір, висота, оптимальна висота та їх відношення
+        """
+        operations = {}
+        totals = dict.fromkeys(_FIELDS, 0)
+        for operation, stats in self.operations.items():
+            operations[operation] = dict(stats)
+            operations[operation]['mean_depth'] = (
+                stats['total_depth'] / stats['descents'] if stats['descents'] else 0
+            )
+            for field in _FIELDS:
+                if field == 'max_depth':
+                    totals[field] = max(totals[field], stats[field])
+                else:
+                    totals[field] += stats[field]
+
+        # Методи класу напряму, щоб знімок не потрапив у власні лічильники
+        tree = self.tree
+        size = self._tree_class.count_nodes(tree)
+        height = self._tree_class.height(tree)
+        optimal = math.ceil(math.log2(size + 1))
+        return {
+            'operations': operations,
+            'totals': totals,
+            'tree': {
+                'size': size,
+                'height': height,
+                'optimal_height': optimal,
+                'height_ratio': height / optimal if optimal else 1.0,
+            },
+        }
+
+    def to_prometheus(self, prefix='bst'):
+        """
+        Знімок метрик у текстовому форматі експозиції Prometheus.
+
+        Args:
+            prefix (str): Префікс імен метрик
+
+        Returns:
+            str: Текст для віддачі з ендпоінта /metrics
+        """
+        snapshot = self.snapshot()
+        counters = [
+            ('operations_total', 'calls', "Кількість викликів операції"),
+            ('comparisons_total', 'comparisons', "Порівняння ключів під час спуску"),
+            ('nodes_visited_total', 'nodes_visited', "Відвідані вузли під час спуску"),
+            ('descents_total', 'descents', "Спуски від кореня"),
+            ('rotations_total', 'rotations', "Повороти під час балансування"),
+            ('allocations_total', 'allocations', "Нові об'єкти вузлів"),
+            ('pool_reuses_total', 'pool_reuses', "Вузли, взяті з пулу"),
+            ('rebuilds_total', 'rebuilds', "Перебудови піддерев"),
+        ]
+        gauges = [
+            ('descent_depth_max', 'max_depth', "Найбільша глибина спуску"),
+            ('descent_depth_mean', 'mean_depth', "Середня глибина спуску"),
+        ]
+
+        lines = []
+        for kind, metrics in (('counter', counters), ('gauge', gauges)):
+            for name, field, description in metrics:
+                lines.append(f"# HELP {prefix}_{name} {description}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+                for operation, stats in sorted(snapshot['operations'].items()):
+                    lines.append(f'{prefix}_{name}{{operation="{operation}"}} {stats[field]}')
+
+        tree_gauges = [
+            ('tree_size', 'size', "Кількість значень у дереві"),
+            ('tree_height', 'height', "Висота дерева"),
+            ('tree_height_ratio', 'height_ratio', "Відношення висоти до оптимальної"),
+        ]
+        for name, field, description in tree_gauges:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {snapshot['tree'][field]}")
+        return "\n".join(lines) + "\n"
+
+def _operation(base, name, measure=None):
+    """
+    Метод підкласу для публічної операції: облік виклику та приписування подій.
+
+    Виклик зсередини іншої операції (наприклад, insert з insert_many чи
+    count_nodes з percentile) не рахується окремим викликом: його спуск і
+    події належать зовнішній операції.
+
+    Args:
+        base (type): Клас дерева без лічильників
+        name (str): Ім'я операції
+        measure (callable): measure(method, tree, metrics, args, kwargs), що
+            виконує операцію з підрахунком її спусків; None - лише облік виклику
+    """
+    method = getattr(base, name)
+
+    def run(tree, metrics, args, kwargs):
+        if measure is None:
+            return method(tree, *args, **kwargs)
+        return measure(method, tree, metrics, args, kwargs)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self._metrics
+        if metrics._current != 'other':
+            return run(self, metrics, args, kwargs)
+
+        metrics.record(name)
+        try:
+            return run(self, metrics, args, kwargs)
+        finally:
+            metrics._current = 'other'
+
+    return wrapper
+
+def _measure_keyed(method, tree, metrics, args, kwargs):
+    """Спуск за ключем: рахуються порівняння загорнутого ключа"""
+    if not args:
+        return method(tree, *args, **kwargs)
+    start = metrics.begin_descent()
+    result = method(tree, _probe(args[0], metrics), *args[1:], **kwargs)
+    metrics.end_descent(start)
+    return result
+
+def _measure_edge(method, tree, metrics, args, kwargs):
+    """Спуск по краю: глибину повідомляє _remove_node або _decrement"""
+    metrics._edge = True
+    try:
+        return method(tree, *args, **kwargs)
+    finally:
+        metrics._edge = False
+
+def _measure_batch(method, tree, metrics, args, kwargs):
+    """Пакет: злиття з деревом чи окремі спуски рахуються за ключами пакета"""
+    if not args:
+        return method(tree, *args, **kwargs)
+    metrics._last = _MISSING
+    keys = [_probe(key, metrics) for key in args[0]]
+    return method(tree, keys, *args[1:], **kwargs)
+
+def _edge_hook(base, name):
+    """
+    Метод підкласу для _remove_node або _decrement: шлях до крайнього
+    вузла, який знайшов pop_min чи pop_max, дає глибину його спуску.
+    """
+    method = getattr(base, name)
+
+    @wraps(method)
+    def wrapper(self, path, node):
+        metrics = self._metrics
+        if metrics._edge:
+            metrics._edge = False
+            metrics.add_cost(len(path) + 1, 0, descent=True)
+        return method(self, path, node)
+
+    return wrapper
+
+def _event(base, name, field):
+    """Метод підкласу для внутрішнього методу, що рахує подію поточної операції"""
+    method = getattr(base, name)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._metrics.count(field)
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+def _instrumented_class(base):
+    """
+    Підклас base з лічильниками (створюється один раз для кожного класу).
+
+    Підклас не додає полів, тож екземпляр base можна перемкнути на нього
+    і назад присвоєнням __class__.
+    """
+    cls = _instrumented_classes.get(base)
+    if cls is not None:
+        return cls
+
+    namespace = {}
+    for name in _KEYED_OPERATIONS:
+        namespace[name] = _operation(base, name, _measure_keyed)
+    for name in _EDGE_OPERATIONS:
+        namespace[name] = _operation(base, name, _measure_edge)
+    for name in _BATCH_OPERATIONS:
+        namespace[name] = _operation(base, name, _measure_batch)
+    for name in _COUNTED_OPERATIONS:
+        namespace[name] = _operation(base, name)
+    for name, field in _EVENTS.items():
+        namespace[name] = _event(base, name, field)
+    for name in ('_remove_node', '_decrement'):
+        namespace[name] = _edge_hook(base, name)
+
+    def _new_node(self, key):
+        # Розрізняє нові вузли та взяті з пулу; у вузол іде справжній ключ
+        self._metrics.count('pool_reuses' if self._node_pool else 'allocations')
+        return base._new_node(self, _unwrap(key))
+
+    def _append_sorted(self, nodes, key):
+        return base._append_sorted(self, nodes, _unwrap(key))
+
+    def _empty_like(self, root=None):
+        # Результати split, join та тимчасові дерева лічильників не мають
+        tree = base._empty_like(self, root)
+        tree.__class__ = base
+        return tree
+
+    namespace.update(_new_node=_new_node, _append_sorted=_append_sorted,
+                     _empty_like=_empty_like)
+    cls = _instrumented_classes[base] = type(base.__name__, (base,), namespace)
+    return cls
+
+def instrument(tree):
+    """
+    Вмикає лічильники для дерева (повторний виклик повертає наявні).
+
+    Args:
+        tree (BinarySearchTree): Дерево будь-якої стратегії балансування
+
+    Returns:
+        TreeMetrics: Лічильники дерева
+    """
+    metrics = tree.__dict__.get('_metrics')
+    if metrics is not None:
+        return metrics
+
+    metrics = TreeMetrics(tree)
+    tree._metrics = metrics
+    # Підклас з лічильниками лише для цього екземпляра
+    tree.__class__ = _instrumented_class(type(tree))
+    return metrics
+
+def uninstrument(tree):
+    """Повертає дереву його клас; методи класу знову викликаються напряму"""
+    metrics = tree.__dict__.pop('_metrics', None)
+    if metrics is None:
+        return
+
+    tree.__class__ = metrics._tree_class
@@ -0,0 +1,251 @@
+"""
+Паралельна агрегація дуже великих дерев у пулі процесів
+
+Для BinarySearchTree паралелізм не потрібен: сума, кількість, мінімум і
+максимум читаються з доповнень кореня та вказівників на крайні вузли за O(1).
+
+Голе дерево з вузлів Node ділиться на неперетинні піддерева: кілька
+верхніх вузлів головний процес рахує сам, а кожне піддерево обходить
+окремий процес пулу concurrent.futures. Пул запускається методом fork,
+тож процеси успадковують дерево як спільну пам'ять (копіювання під час
+запису) - вузли не серіалізуються, процесу передається лише шлях від
+кореня до його піддерева. Отже паралельно виконується саме інтерпретований
+O(n) обхід, а не лише підсумовування готового буфера.
+
+ArrayTree вже зберігає ключі в типізованому масиві, тож він одним
+копіюванням експортується в буфер спільної пам'яті
+(multiprocessing.shared_memory) і ділиться на діапазони позицій.
+
+Цілі ключі лишаються цілими (int64 у буфері, int Python у вузлах), тож
+сума точна. Потребує Python 3.8+ (shared_memory); NumPy необов'язковий:
+з ним часткові агрегати буфера рахуються векторизовано. Без fork (Windows,
+macOS) дерево з вузлів агрегується в поточному процесі.
+"""
+
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необов'язковий: без нього працює чистий Python
+    np = None
+
+from array_tree import ArrayTree
+from bst import BinarySearchTree
+
+# Нижче цього розміру запуск процесів дорожчий за послідовний підрахунок
+MIN_PARALLEL_SIZE = 100_000
+# Скільки піддерев припадає на процес: дрібніші частини вирівнюють
+# навантаження, коли піддерева незбалансованого дерева різні за розміром
+SUBTREES_PER_WORKER = 4
+
+# Корінь дерева в процесі пулу (успадковується через fork, див. _set_root)
+_root = None
+
+def _aggregate(node):
+    """
+    Рахує (сума, кількість, мінімум, максимум) піддерева ітеративним обходом.
+
+    Returns:
+        tuple: Частковий агрегат (None для порожнього піддерева)
+    """
+    if node is None:
+        return None
+
+    total_sum = count = 0
+    lowest = highest = node.key
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        key = current.key
+        total_sum += key * current.count
+        count += current.count
+        if key < lowest:
+            lowest = key
+        if key > highest:
+            highest = key
+        if current.left is not None:
+            stack.append(current.left)
+        if current.right is not None:
+            stack.append(current.right)
+    return total_sum, count, lowest, highest
+
+def _set_root(root):
+    """Ініціалізатор процесу пулу: запам'ятовує успадкований корінь"""
+    global _root
+    _root = root
+
+def _subtree_aggregate(path):
+    """
+    Агрегат піддерева, до якого веде path від кореня ('l' - ліворуч, 'r' - праворуч).
+
+    Виконується в процесі пулу над деревом, успадкованим через fork.
+    """
+    node = _root
+    for step in path:
+        node = node.left if step == 'l' else node.right
+    return _aggregate(node)
+
+def _split_subtrees(root, parts):
+    """
+    Ділить дерево на верхні вузли та неперетинні піддерева.
+
+    Фронт піддерев розширюється в ширину, поки їх менше за parts. Кількість
+    розширень обмежена, тож для виродженого дерева (ланцюжка) фронт
+    лишається малим замість послідовного спуску всім ланцюжком.
+
+    Returns:
+        tuple: (верхні вузли, шляхи до коренів піддерев)
+    """
+    top = []
+    frontier = [(root, '')]
+    expansions = 0
+    while frontier and len(frontier) < parts and expansions < 4 * parts:
+        node, path = frontier.pop(0)
+        top.append(node)
+        expansions += 1
+        if node.left is not None:
+            frontier.append((node.left, path + 'l'))
+        if node.right is not None:
+            frontier.append((node.right, path + 'r'))
+    return top, [path for _, path in frontier]
+
+def _export_keys(source):
+    """
+    Копіює ключі ArrayTree в новий сегмент спільної пам'яті.
+
+    Returns:
+        tuple: (SharedMemory, кількість ключів, тип ключів 'd' або 'q')
+    """
+    typecode = source._keys.typecode
+    if np is not None:
+        keys = source.to_numpy(copy=False)
+        count = int(keys.size)
+        memory = shared_memory.SharedMemory(create=True, size=max(count, 1) * 8)
+        target = np.ndarray((count,), dtype=keys.dtype, buffer=memory.buf)
+        target[:] = keys
+        del target
+        return memory, count, typecode
+
+    keys = array(typecode, source)
+    count = len(keys)
+    memory = shared_memory.SharedMemory(create=True, size=max(count, 1) * 8)
+    with memory.buf.cast(typecode) as target:
+        target[:count] = memoryview(keys)
+    return memory, count, typecode
+
+def _partial_aggregate(name, typecode, start, stop):
+    """
+    Рахує (сума, кількість, мінімум, максимум) для позицій [start, stop).
+
+    Виконується в процесі пулу: підключається до сегмента за іменем і
+    читає лише свій діапазон.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        if np is not None:
+            dtype = np.float64 if typecode == 'd' else np.int64
+            chunk = np.frombuffer(memory.buf, dtype=dtype, count=stop - start, offset=start * 8)
+            lowest, highest = chunk.min().item(), chunk.max().item()
+            total_sum = chunk.sum().item()
+            if typecode == 'q' and max(-lowest, highest) * (stop - start) >= 2 ** 63:
+                # Сума int64 переповнюється мовчки; у сумнівному разі рахуємо точно
+                total_sum = sum(chunk.tolist())
+            del chunk
+            return total_sum, stop - start, lowest, highest
+
+        with memory.buf.cast(typecode) as values, values[start:stop] as chunk:
+            return sum(chunk), stop - start, min(chunk), max(chunk)
+    finally:
+        memory.close()
+
+def _combine(partials):
+    """Об'єднує часткові агрегати в статистику у форматі tree_statistics"""
+    partials = [partial for partial in partials if partial is not None]
+    total_sum = sum(partial[0] for partial in partials)
+    count = sum(partial[1] for partial in partials)
+    if count == 0:
+        return {'sum': 0, 'count': 0, 'average': 0, 'min': None, 'max': None}
+
+    return {
+        'sum': total_sum,
+        'count': count,
+        'average': total_sum / count,
+        'min': min(partial[2] for partial in partials),
+        'max': max(partial[3] for partial in partials)
+    }
+
+def _array_statistics(source, workers, executor):
+    """Агрегація ArrayTree за діапазонами позицій буфера спільної пам'яті"""
+    memory, count, typecode = _export_keys(source)
+    try:
+        if count < MIN_PARALLEL_SIZE or workers == 1:
+            return _combine([_partial_aggregate(memory.name, typecode, 0, count)] if count else [])
+
+        # Неперетинні діапазони позицій приблизно однакового розміру
+        bounds = [count * part // workers for part in range(workers + 1)]
+        ranges = [(start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop]
+        names = [memory.name] * len(ranges)
+        typecodes = [typecode] * len(ranges)
+        starts = [start for start, _ in ranges]
+        stops = [stop for _, stop in ranges]
+
+        if executor is not None:
+            partials = list(executor.map(_partial_aggregate, names, typecodes, starts, stops))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(_partial_aggregate, names, typecodes, starts, stops))
+
+        return _combine(partials)
+    finally:
+        memory.close()
+        memory.unlink()
+
+def _node_statistics(root, workers):
+    """Агрегація дерева з вузлів: верхні вузли тут, піддерева - у процесах пулу"""
+    if root is None:
+        return _combine([])
+    # Розмір піддерева з доповнень кореня: малі дерева не варті запуску пулу
+    if (root.size < MIN_PARALLEL_SIZE or workers == 1
+            or 'fork' not in multiprocessing.get_all_start_methods()):
+        return _combine([_aggregate(root)])
+
+    top, paths = _split_subtrees(root, workers * SUBTREES_PER_WORKER)
+    partials = [(node.key * node.count, node.count, node.key, node.key) for node in top]
+
+    # fork: процеси бачать дерево без серіалізації, передаються лише шляхи
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_set_root, initargs=(root,)) as pool:
+        partials.extend(pool.map(_subtree_aggregate, paths))
+
+    return _combine(partials)
+
+def parallel_tree_statistics(source, workers=None, executor=None):
+    """
+    Обчислює суму, кількість, середнє, мінімум і максимум у пулі процесів.
+
+    Args:
+        source (Node | BinarySearchTree | ArrayTree): Корінь дерева або дерево
+        workers (int): Кількість процесів (за замовчуванням - кількість ядер)
+        executor (ProcessPoolExecutor): Наявний пул для повторних викликів з
+            ArrayTree; дерево з вузлів потребує пулу, створеного після
+            передачі кореня, тож для нього пул завжди створюється всередині
+
+    Returns:
+        dict: Статистика з ключами 'sum', 'count', 'average', 'min', 'max'
+    """
+    if isinstance(source, BinarySearchTree):
+        # Доповнення кореня вже містять усі агрегати
+        count = source.count_nodes()
+        if count == 0:
+            return _combine([])
+        return _combine([(source.sum_values(), count, source.find_min(), source.find_max())])
+
+    workers = workers or os.cpu_count() or 1
+    if isinstance(source, ArrayTree):
+        return _array_statistics(source, workers, executor)
+    return _node_statistics(source, workers)
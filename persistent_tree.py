@@ -0,0 +1,285 @@
+"""
+Персистентне AVL-дерево з копіюванням шляху
+
+Запис ніколи не змінює наявних вузлів: вставка чи видалення копіює лише
+вузли на шляху від кореня до місця зміни (O(log n) нових вузлів), а решта
+дерева спільно використовується старою та новою версіями. Нова версія
+публікується одним присвоєнням атрибута, тому читачі без жодних блокувань
+отримують за O(1) узгоджений незмінний знімок і можуть обходити його
+(sum_tree_iterative, tree_statistics тощо), поки писачі продовжують роботу.
+
+Обхід Морріса (morris_inorder) тимчасово змінює вузли, тож для знімків,
+які читають кілька потоків, його використовувати не можна.
+"""
+
+import threading
+
+from bst import AVLTree, BinarySearchTree, Node, _height, _size, _total
+
+def _clone(node):
+    """Копія вузла з тими самими дітьми та доповненнями"""
+    copy = Node(node.key)
+    copy.left = node.left
+    copy.right = node.right
+    copy.count = node.count
+    copy.height = node.height
+    copy.size = node.size
+    copy.total = node.total
+    return copy
+
+def _update(node):
+    """Перераховує висоту, розмір та суму піддерева за дітьми"""
+    left, right = node.left, node.right
+    node.height = 1 + max(_height(left), _height(right))
+    node.size = node.count + _size(left) + _size(right)
+    node.total = node.key * node.count + _total(left) + _total(right)
+
+def _rotate_left(node):
+    """Лівий поворот; спільний (не скопійований) вузол-опору спершу копіюємо"""
+    pivot = _clone(node.right)
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+def _rotate_right(node):
+    """Правий поворот; спільний (не скопійований) вузол-опору спершу копіюємо"""
+    pivot = _clone(node.left)
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+def _rebalance(node):
+    """
+    Відновлює AVL-баланс свіжоскопійованого вузла.
+
+    Returns:
+        Node: Новий корінь піддерева
+    """
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(_clone(node.left))
+        return _rotate_right(node)
+
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(_clone(node.right))
+        return _rotate_left(node)
+
+    return node
+
+def _copy_path(path):
+    """
+    Копіює вузли шляху від кореня та зв'язує копії між собою.
+
+    Returns:
+        list: Копії вузлів у тому ж порядку
+    """
+    copies = [_clone(node) for node in path]
+    for i in range(len(path) - 1):
+        if path[i].left is path[i + 1]:
+            copies[i].left = copies[i + 1]
+        else:
+            copies[i].right = copies[i + 1]
+    return copies
+
+def _rebuild(copies):
+    """
+    Балансує скопійований шлях знизу вгору.
+
+    Args:
+        copies (list): Скопійовані вузли шляху від кореня (не порожній)
+
+    Returns:
+        Node: Корінь нової версії дерева
+    """
+    for i in range(len(copies) - 1, 0, -1):
+        node = copies[i]
+        balanced = _rebalance(node)
+        parent = copies[i - 1]
+        if parent.left is node:
+            parent.left = balanced
+        else:
+            parent.right = balanced
+    return _rebalance(copies[0])
+
+class TreeSnapshot(BinarySearchTree):
+    """
+    Незмінна версія дерева для читання без блокувань.
+
+    Підтримує всі запити BinarySearchTree (find_max, find_min, sum_values,
+    select, iter_range, ...), а спроба змінити знімок викликає TypeError.
+    """
+
+    def __init__(self, root, min_node, max_node, version, multiset=False):
+        super().__init__(multiset=multiset)
+        self.root = root
+        self._min_node = min_node
+        self._max_node = max_node
+        self.version = version
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Знімок дерева не можна змінювати")
+
+    insert = delete = pop_min = pop_max = insert_many = bulk_load = _read_only
+    # Розділення, з'єднання та злиття перев'язують вузли, спільні з живим деревом
+    split = _take_root = _ensure_mutable = _read_only
+
+class PersistentTree:
+    """
+    Персистентне AVL-дерево: писачі публікують нові корені, читачі беруть знімки.
+
+    Записи серіалізуються між собою блокуванням писачів; читання (snapshot
+    і методи-запити) блокувань не беруть.
+    """
+
+    def __init__(self, multiset=False):
+        self.multiset = multiset
+        self._write_lock = threading.Lock()
+        # Опублікований стан: (корінь, мінімальний вузол, максимальний вузол, версія)
+        self._state = (None, None, None, 0)
+
+    @classmethod
+    def from_iterable(cls, iterable, multiset=False):
+        """Створює збалансоване дерево з довільної послідовності значень (див. bulk_load)"""
+        tree = cls(multiset=multiset)
+        source = AVLTree.from_iterable(iterable, multiset=multiset)
+        tree._state = (source.root, source._min_node, source._max_node, 1)
+        return tree
+
+    def snapshot(self):
+        """
+        Повертає незмінний знімок поточної версії за O(1).
+
+        Returns:
+            TreeSnapshot: Знімок, який не змінюється наступними записами
+        """
+        root, min_node, max_node, version = self._state
+        return TreeSnapshot(root, min_node, max_node, version, multiset=self.multiset)
+
+    @property
+    def version(self):
+        """Номер поточної опублікованої версії"""
+        return self._state[3]
+
+    def _publish(self, root):
+        """Публікує новий корінь разом із крайніми вузлами однією атомарною заміною"""
+        min_node = max_node = root
+        if root is not None:
+            while min_node.left is not None:
+                min_node = min_node.left
+            while max_node.right is not None:
+                max_node = max_node.right
+        self._state = (root, min_node, max_node, self._state[3] + 1)
+
+    def insert(self, key):
+        """Вставка значення: копіюється лише шлях від кореня до нового вузла"""
+        with self._write_lock:
+            path = []
+            node = self._state[0]
+            while node is not None:
+                path.append(node)
+                if key < node.key:
+                    node = node.left
+                elif key > node.key:
+                    node = node.right
+                else:
+                    if self.multiset:
+                        copies = _copy_path(path)
+                        copies[-1].count += 1
+                        self._publish(_rebuild(copies))
+                    return
+
+            new_node = Node(key)
+            if not path:
+                self._publish(new_node)
+                return
+
+            copies = _copy_path(path)
+            if key < copies[-1].key:
+                copies[-1].left = new_node
+            else:
+                copies[-1].right = new_node
+            self._publish(_rebuild(copies))
+
+    def delete(self, key):
+        """
+        Видаляє значення (одне входження в режимі мультимножини).
+
+        Returns:
+            bool: True, якщо значення було знайдено та видалено
+        """
+        with self._write_lock:
+            path = []
+            node = self._state[0]
+            while node is not None and node.key != key:
+                path.append(node)
+                node = node.left if key < node.key else node.right
+
+            if node is None:
+                return False
+
+            path.append(node)
+            if node.count > 1:
+                copies = _copy_path(path)
+                copies[-1].count -= 1
+                self._publish(_rebuild(copies))
+                return True
+
+            target_index = len(path) - 1
+            if node.left is not None and node.right is not None:
+                # Вузол з двома дітьми: копіюємо шлях до наступника
+                successor = node.right
+                while successor is not None:
+                    path.append(successor)
+                    successor = successor.left
+
+            copies = _copy_path(path)
+            removed = copies.pop()
+            if target_index < len(copies):
+                copies[target_index].key = removed.key
+                copies[target_index].count = removed.count
+
+            child = removed.left if removed.left is not None else removed.right
+            if not copies:
+                self._publish(child)
+                return True
+
+            if copies[-1].left is removed:
+                copies[-1].left = child
+            else:
+                copies[-1].right = child
+            self._publish(_rebuild(copies))
+            return True
+
+    def find_max(self):
+        """Найбільше значення поточної версії або None"""
+        max_node = self._state[2]
+        return max_node.key if max_node is not None else None
+
+    def find_min(self):
+        """Найменше значення поточної версії або None"""
+        min_node = self._state[1]
+        return min_node.key if min_node is not None else None
+
+    def sum_values(self):
+        """Сума всіх значень поточної версії за O(1)"""
+        return _total(self._state[0])
+
+    def count_nodes(self):
+        """Кількість значень поточної версії за O(1)"""
+        return _size(self._state[0])
+
+    def average_value(self):
+        """Середнє арифметичне значення поточної версії"""
+        return self.snapshot().average_value()
+
+    def display_inorder(self):
+        """Значення поточної версії в порядку зростання"""
+        return self.snapshot().display_inorder()
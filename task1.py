@@ -2,76 +2,11 @@
 Завдання 1: Знаходження найбільшого значення у двійковому дереві пошуку або AVL-дереві
 
 Реалізація включає:
-- Клас Node для представлення вузла дерева
-- Клас BinarySearchTree для двійкового дерева пошуку
+- Класи Node, BinarySearchTree та AVLTree зі спільного модуля bst
 - Функцію find_max для знаходження найбільшого значення
 """
 
-class Node:
-    """Клас для представлення вузла дерева"""
-    def __init__(self, key):
-        self.key = key
-        self.left = None
-        self.right = None
-
-class BinarySearchTree:
-    """Клас для двійкового дерева пошуку"""
-    def __init__(self):
-        self.root = None
-    
-    def insert(self, key):
-        """Вставка нового значення в дерево"""
-        if self.root is None:
-            self.root = Node(key)
-        else:
-            self._insert_recursive(self.root, key)
-    
-    def _insert_recursive(self, node, key):
-        """Рекурсивна вставка значення"""
-        if key < node.key:
-            if node.left is None:
-                node.left = Node(key)
-            else:
-                self._insert_recursive(node.left, key)
-        elif key > node.key:
-            if node.right is None:
-                node.right = Node(key)
-            else:
-                self._insert_recursive(node.right, key)
-        # Якщо key == node.key, не вставляємо дублікат
-    
-    def find_max(self):
-        """
-        Знаходить найбільше значення в дереві.
-        
-        У двійковому дереві пошуку найбільше значення завжди знаходиться
-        в найправішому вузлі дерева.
-        
-        Returns:
-            int/float: Найбільше значення в дереві або None, якщо дерево порожнє
-        """
-        if self.root is None:
-            return None
-        
-        current = self.root
-        # Йдемо вправо до тих пір, поки не досягнемо найправішого вузла
-        while current.right is not None:
-            current = current.right
-        
-        return current.key
-    
-    def display_inorder(self):
-        """Виводить дерево в порядку зростання (in-order traversal)"""
-        result = []
-        self._inorder_recursive(self.root, result)
-        return result
-    
-    def _inorder_recursive(self, node, result):
-        """Рекурсивний обхід дерева в порядку зростання"""
-        if node is not None:
-            self._inorder_recursive(node.left, result)
-            result.append(node.key)
-            self._inorder_recursive(node.right, result)
+from bst import Node, BinarySearchTree, AVLTree
 
 def find_max_in_bst(root):
     """
@@ -93,25 +28,9 @@ def find_max_in_bst(root):
     
     return current.key
 
-def find_max_recursive(root):
-    """
-    Рекурсивна версія пошуку найбільшого значення.
-    
-    Args:
-        root (Node): Корінь дерева
-        
-    Returns:
-        int/float: Найбільше значення в дереві або None, якщо дерево порожнє
-    """
-    if root is None:
-        return None
-    
-    # Якщо немає правої дитини, поточний вузол має максимальне значення
-    if root.right is None:
-        return root.key
-    
-    # Інакше рекурсивно шукаємо в правому піддереві
-    return find_max_recursive(root.right)
+# Назва збережена для наявних викликачів: пошук виконується тим самим циклом,
+# що й find_max_in_bst, тож результат однаковий і без ліміту рекурсії
+find_max_recursive = find_max_in_bst
 
 # Демонстрація роботи
 def main():
@@ -144,15 +63,19 @@ def main():
     max_value_2 = find_max_in_bst(bst.root)
     print(f"   Функція з root: {max_value_2}")
     
-    # Рекурсивна функція
+    # Сумісна назва тієї самої функції
     max_value_3 = find_max_recursive(bst.root)
-    print(f"   Рекурсивна функція: {max_value_3}")
+    print(f"   Функція find_max_recursive: {max_value_3}")
     
     # Перевірка на порожньому дереві
     empty_bst = BinarySearchTree()
     max_empty = empty_bst.find_max()
     print(f"   Порожнє дерево: {max_empty}")
     
+    # Три найбільші значення лінивим переглядом у зворотному порядку
+    top_three = [key for key, _ in zip(bst.iter_range(reverse=True), range(3))]
+    print(f"   Три найбільші значення: {top_three}")
+    
     print(f"\n✅ Найбільше значення в дереві: {max_value_1}")
     
     # Додаткові тести
@@ -176,6 +99,12 @@ def main():
     for val in float_values:
         float_bst.insert(val)
     print(f"   Дерево з дробовими числами {float_values}: {float_bst.find_max()}")
+    
+    # Тест з AVL-деревом на монотонно зростаючих даних
+    avl = AVLTree()
+    for val in range(1, 1001):
+        avl.insert(val)
+    print(f"   AVL-дерево з 1000 зростаючих значень: {avl.find_max()} (висота {avl.height()})")
 
 if __name__ == "__main__":
     main()
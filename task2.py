@@ -2,76 +2,11 @@
 Завдання 2: Знаходження найменшого значення у двійковому дереві пошуку або AVL-дереві
 
 Реалізація включає:
-- Клас Node для представлення вузла дерева
-- Клас BinarySearchTree для двійкового дерева пошуку
+- Класи Node, BinarySearchTree та AVLTree зі спільного модуля bst
 - Функцію find_min для знаходження найменшого значення
 """
 
-class Node:
-    """Клас для представлення вузла дерева"""
-    def __init__(self, key):
-        self.key = key
-        self.left = None
-        self.right = None
-
-class BinarySearchTree:
-    """Клас для двійкового дерева пошуку"""
-    def __init__(self):
-        self.root = None
-    
-    def insert(self, key):
-        """Вставка нового значення в дерево"""
-        if self.root is None:
-            self.root = Node(key)
-        else:
-            self._insert_recursive(self.root, key)
-    
-    def _insert_recursive(self, node, key):
-        """Рекурсивна вставка значення"""
-        if key < node.key:
-            if node.left is None:
-                node.left = Node(key)
-            else:
-                self._insert_recursive(node.left, key)
-        elif key > node.key:
-            if node.right is None:
-                node.right = Node(key)
-            else:
-                self._insert_recursive(node.right, key)
-        # Якщо key == node.key, не вставляємо дублікат
-    
-    def find_min(self):
-        """
-        Знаходить найменше значення в дереві.
-        
-        У двійковому дереві пошуку найменше значення завжди знаходиться
-        в найлівішому вузлі дерева.
-        
-        Returns:
-            int/float: Найменше значення в дереві або None, якщо дерево порожнє
-        """
-        if self.root is None:
-            return None
-        
-        current = self.root
-        # Йдемо вліво до тих пір, поки не досягнемо найлівішого вузла
-        while current.left is not None:
-            current = current.left
-        
-        return current.key
-    
-    def display_inorder(self):
-        """Виводить дерево в порядку зростання (in-order traversal)"""
-        result = []
-        self._inorder_recursive(self.root, result)
-        return result
-    
-    def _inorder_recursive(self, node, result):
-        """Рекурсивний обхід дерева в порядку зростання"""
-        if node is not None:
-            self._inorder_recursive(node.left, result)
-            result.append(node.key)
-            self._inorder_recursive(node.right, result)
+from bst import Node, BinarySearchTree, AVLTree
 
 def find_min_in_bst(root):
     """
@@ -93,36 +28,27 @@ def find_min_in_bst(root):
     
     return current.key
 
-def find_min_recursive(root):
-    """
-    Рекурсивна версія пошуку найменшого значення.
-    
-    Args:
-        root (Node): Корінь дерева
-        
-    Returns:
-        int/float: Найменше значення в дереві або None, якщо дерево порожнє
-    """
-    if root is None:
-        return None
-    
-    # Якщо немає лівої дитини, поточний вузол має мінімальне значення
-    if root.left is None:
-        return root.key
-    
-    # Інакше рекурсивно шукаємо в лівому піддереві
-    return find_min_recursive(root.left)
+# Назва збережена для наявних викликачів: пошук виконується тим самим циклом,
+# що й find_min_in_bst, тож результат однаковий і без ліміту рекурсії
+find_min_recursive = find_min_in_bst
 
 def find_min_max_pair(root):
     """
     Знаходить пару мінімальне-максимальне значення в дереві.
+
+    Для об'єкта BinarySearchTree пара читається з підтримуваних деревом
+    вказівників на крайні вузли за O(1); для голого вузла виконуються
+    два спуски по краях дерева.
     
     Args:
-        root (Node): Корінь дерева
+        root (Node | BinarySearchTree): Корінь дерева або саме дерево
         
     Returns:
         tuple: (min_value, max_value) або (None, None) для порожнього дерева
     """
+    if isinstance(root, BinarySearchTree):
+        return root.find_min_max()
+
     if root is None:
         return None, None
     
@@ -169,13 +95,19 @@ def main():
     min_value_2 = find_min_in_bst(bst.root)
     print(f"   Функція з root: {min_value_2}")
     
-    # Рекурсивна функція
+    # Сумісна назва тієї самої функції
     min_value_3 = find_min_recursive(bst.root)
-    print(f"   Рекурсивна функція: {min_value_3}")
+    print(f"   Функція find_min_recursive: {min_value_3}")
     
     # Пара мін-макс
     min_val, max_val = find_min_max_pair(bst.root)
     print(f"   Пара мін-макс: ({min_val}, {max_val})")
+    print(f"   Пара мін-макс з вказівників дерева: {find_min_max_pair(bst)}")
+    
+    # Видалення найменшого значення оновлює вказівник на мінімум
+    popped = bst.pop_min()
+    print(f"   pop_min(): {popped}, новий мінімум: {bst.find_min()}")
+    bst.insert(popped)
     
     # Перевірка на порожньому дереві
     empty_bst = BinarySearchTree()
@@ -219,6 +151,12 @@ def main():
     for val in right_values:
         right_linear_bst.insert(val)
     print(f"   Лінійне дерево (права сторона) {right_values}: {right_linear_bst.find_min()}")
+    
+    # Те саме лінійне введення в AVL-дереві залишається збалансованим
+    avl = AVLTree()
+    for val in right_values:
+        avl.insert(val)
+    print(f"   AVL-дерево {right_values}: {avl.find_min()} (висота {avl.height()})")
 
 if __name__ == "__main__":
     main()
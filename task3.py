@@ -2,102 +2,22 @@
 Завдання 3: Знаходження суми всіх значень у двійковому дереві пошуку або AVL-дереві
 
 Реалізація включає:
-- Клас Node для представлення вузла дерева
-- Клас BinarySearchTree для двійкового дерева пошуку
+- Класи Node, BinarySearchTree та AVLTree зі спільного модуля bst
 - Функцію sum_values для знаходження суми всіх значень
 - Різні варіанти обходу дерева для обчислення суми
+- Варіанти на основі обходу Морріса з O(1) додаткової пам'яті
+- Векторизовану статистику на NumPy (якщо встановлено)
 """
 
-class Node:
-    """Клас для представлення вузла дерева"""
-    def __init__(self, key):
-        self.key = key
-        self.left = None
-        self.right = None
+import math
 
-class BinarySearchTree:
-    """Клас для двійкового дерева пошуку"""
-    def __init__(self):
-        self.root = None
-    
-    def insert(self, key):
-        """Вставка нового значення в дерево"""
-        if self.root is None:
-            self.root = Node(key)
-        else:
-            self._insert_recursive(self.root, key)
-    
-    def _insert_recursive(self, node, key):
-        """Рекурсивна вставка значення"""
-        if key < node.key:
-            if node.left is None:
-                node.left = Node(key)
-            else:
-                self._insert_recursive(node.left, key)
-        elif key > node.key:
-            if node.right is None:
-                node.right = Node(key)
-            else:
-                self._insert_recursive(node.right, key)
-        # Якщо key == node.key, не вставляємо дублікат
-    
-    def sum_values(self):
-        """
-        Знаходить суму всіх значень в дереві.
-        
-        Returns:
-            int/float: Сума всіх значень в дереві або 0, якщо дерево порожнє
-        """
-        return self._sum_recursive(self.root)
-    
-    def _sum_recursive(self, node):
-        """
-        Рекурсивна функція для обчислення суми всіх значень.
-        
-        Args:
-            node (Node): Поточний вузол
-            
-        Returns:
-            int/float: Сума значень у піддереві з коренем у node
-        """
-        if node is None:
-            return 0
-        
-        # Сума = значення поточного вузла + сума лівого піддерева + сума правого піддерева
-        return node.key + self._sum_recursive(node.left) + self._sum_recursive(node.right)
-    
-    def count_nodes(self):
-        """Підраховує кількість вузлів у дереві"""
-        return self._count_nodes_recursive(self.root)
-    
-    def _count_nodes_recursive(self, node):
-        """Рекурсивна функція для підрахунку вузлів"""
-        if node is None:
-            return 0
-        return 1 + self._count_nodes_recursive(node.left) + self._count_nodes_recursive(node.right)
-    
-    def average_value(self):
-        """Обчислює середнє арифметичне значення всіх вузлів"""
-        total_sum = self.sum_values()
-        node_count = self.count_nodes()
-        
-        if node_count == 0:
-            return 0
-        
-        return total_sum / node_count
-    
-    def display_inorder(self):
-        """Виводить дерево в порядку зростання (in-order traversal)"""
-        result = []
-        self._inorder_recursive(self.root, result)
-        return result
-    
-    def _inorder_recursive(self, node, result):
-        """Рекурсивний обхід дерева в порядку зростання"""
-        if node is not None:
-            self._inorder_recursive(node.left, result)
-            result.append(node.key)
-            self._inorder_recursive(node.right, result)
+try:
+    import numpy as np
+except ImportError:  # NumPy необов'язковий: без нього працює чистий Python
+    np = None
+
+from array_tree import ArrayTree
+from bst import Node, BinarySearchTree, AVLTree, iter_keys, morris_inorder
 
 def sum_tree_iterative(root):
     """
@@ -117,7 +37,7 @@ def sum_tree_iterative(root):
     
     while stack:
         current = stack.pop()
-        total_sum += current.key
+        total_sum += current.key * current.count
         
         # Додаємо дітей до стека
         if current.right:
@@ -146,7 +66,7 @@ def sum_tree_level_order(root):
     
     while queue:
         current = queue.popleft()
-        total_sum += current.key
+        total_sum += current.key * current.count
         
         # Додаємо дітей до черги
         if current.left:
@@ -156,24 +76,56 @@ def sum_tree_level_order(root):
     
     return total_sum
 
-def tree_statistics(root):
+def _percentile_of_sorted(values, p):
+    """Процентиль p відсортованого списку з лінійною інтерполяцією (як BinarySearchTree.percentile)"""
+    position = (len(values) - 1) * p / 100
+    lower = int(position)
+    fraction = position - lower
+    if fraction == 0:
+        return values[lower]
+    return values[lower] + (values[lower + 1] - values[lower]) * fraction
+
+def tree_statistics(root, percentiles=(50, 90, 99)):
     """
     Обчислює різноманітні статистики дерева.
+
+    Для об'єкта BinarySearchTree сума, кількість та середнє беруться з
+    доповнень кореня за O(1), мінімум і максимум - з вказівників на крайні
+    вузли, а кожен процентиль - через select за O(h). Для голого вузла
+    виконується повний обхід.
     
     Args:
-        root (Node): Корінь дерева
+        root (Node | BinarySearchTree): Корінь дерева або саме дерево
+        percentiles (tuple): Процентилі (0-100), які додаються як ключі 'p50', 'p90' тощо
         
     Returns:
         dict: Словник зі статистиками
     """
+    if isinstance(root, BinarySearchTree):
+        tree = root
+        count = tree.count_nodes()
+        stats = {
+            'sum': tree.sum_values(),
+            'count': count,
+            'average': tree.average_value(),
+            'min': tree.find_min(),
+            'max': tree.find_max()
+        }
+        for p in percentiles:
+            stats[f'p{p}'] = tree.percentile(p)
+        return stats
+
     if root is None:
-        return {
+        stats = {
             'sum': 0,
             'count': 0,
             'average': 0,
             'min': None,
             'max': None
         }
+        for p in percentiles:
+            stats[f'p{p}'] = None
+        return stats
     
     # Збираємо всі значення для статистичного аналізу
     values = []
@@ -182,19 +134,230 @@ def tree_statistics(root):
     while stack:
         current = stack.pop()
         values.append(current.key)
+        if current.count > 1:
+            # Режим мультимножини: ключ входить count разів
+            values.extend([current.key] * (current.count - 1))
         
         if current.right:
             stack.append(current.right)
         if current.left:
             stack.append(current.left)
     
-    return {
+    stats = {
         'sum': sum(values),
         'count': len(values),
         'average': sum(values) / len(values),
         'min': min(values),
         'max': max(values)
     }
+    if percentiles:
+        values.sort()
+        for p in percentiles:
+            stats[f'p{p}'] = _percentile_of_sorted(values, p)
+    return stats
+
+def sum_tree_morris(root):
+    """
+    Підрахунок суми обходом Морріса без стека та черги.
+
+    На відміну від sum_tree_iterative та sum_tree_level_order, що тримають
+    O(h) або O(ширина) вузлів, використовує O(1) додаткової пам'яті;
+    дерево тимчасово прошивається та відновлюється після обходу.
+    
+    Args:
+        root (Node): Корінь дерева
+        
+    Returns:
+        int/float: Сума всіх значень в дереві
+    """
+    total_sum = 0
+    for key in morris_inorder(root):
+        total_sum += key
+    return total_sum
+
+def tree_statistics_morris(root, percentiles=(50, 90, 99)):
+    """
+    Обчислює ті самі статистики, що й tree_statistics, з O(1) додаткової пам'яті.
+
+    Перший обхід Морріса рахує суму й кількість (мінімум - перше значення,
+    максимум - останнє). Якщо потрібні процентилі, другий обхід вибирає
+    лише значення на потрібних позиціях відсортованої послідовності.
+    
+    Args:
+        root (Node): Корінь дерева
+        percentiles (tuple): Процентилі (0-100), які додаються як ключі 'p50', 'p90' тощо
+        
+    Returns:
+        dict: Словник зі статистиками
+    """
+    total_sum = 0
+    count = 0
+    min_value = max_value = None
+
+    for key in morris_inorder(root):
+        if count == 0:
+            min_value = key
+        max_value = key
+        total_sum += key
+        count += 1
+
+    stats = {
+        'sum': total_sum,
+        'count': count,
+        'average': total_sum / count if count else 0,
+        'min': min_value,
+        'max': max_value
+    }
+    if count == 0:
+        for p in percentiles:
+            stats[f'p{p}'] = None
+        return stats
+
+    # Позиції, які треба прочитати: нижня та верхня для інтерполяції
+    wanted = {}
+    for p in percentiles:
+        position = (count - 1) * p / 100
+        lower = int(position)
+        wanted[lower] = None
+        if position > lower:
+            wanted[lower + 1] = None
+
+    positions = sorted(wanted)
+    if positions:
+        next_slot = 0
+        next_position = positions[0]
+        for index, key in enumerate(morris_inorder(root)):
+            if index == next_position:
+                wanted[index] = key
+                next_slot += 1
+                if next_slot == len(positions):
+                    break  # Генератор сам знімає прошивки при закритті
+                next_position = positions[next_slot]
+
+    for p in percentiles:
+        position = (count - 1) * p / 100
+        lower = int(position)
+        fraction = position - lower
+        if fraction == 0:
+            stats[f'p{p}'] = wanted[lower]
+        else:
+            stats[f'p{p}'] = wanted[lower] + (wanted[lower + 1] - wanted[lower]) * fraction
+
+    return stats
+
+def _numpy_keys(keys):
+    """
+    Масив NumPy з відсортованими ключами без втрати точності.
+
+    Цілі ключі в межах int64 стають масивом int64, ключі з дробовими
+    значеннями - float64.
+
+    Returns:
+        ndarray: Масив ключів або None, якщо цілі ключі не вміщаються в int64
+    """
+    if all(isinstance(key, int) for key in keys):
+        if keys and not (-2 ** 63 <= keys[0] and keys[-1] < 2 ** 63):
+            return None
+        return np.array(keys, dtype=np.int64)
+    return np.array(keys, dtype=np.float64)
+
+def tree_statistics_numpy(source, percentiles=(50, 90, 99)):
+    """
+    Розширена статистика з векторизованими обчисленнями NumPy.
+
+    Ключі експортуються в буфер NumPy за один обхід (для ArrayTree масив
+    ключів читається без обходу взагалі), після чого сума, середнє, мінімум,
+    максимум, дисперсія, стандартне відхилення та процентилі рахуються
+    векторизованими функціями. Цілі ключі лишаються цілими (int64), тож
+    сума точна; ключі поза межами int64 та відсутність NumPy обробляються
+    чистим Python з тими самими результатами.
+    
+    Args:
+        source (Node | BinarySearchTree | ArrayTree): Корінь дерева або дерево
+        percentiles (tuple): Процентилі (0-100), які додаються як ключі 'p50', 'p90' тощо
+        
+    Returns:
+        dict: Словник зі статистиками, включно з 'variance' та 'std' (генеральні)
+    """
+    vectorized = np is not None
+    if vectorized and isinstance(source, ArrayTree):
+        # Представлення без копіювання живе лише до кінця цієї функції
+        values = source.to_numpy(copy=False)
+        count = int(values.size)
+    else:
+        values = list(iter_keys(source))
+        count = len(values)
+        array = _numpy_keys(values) if vectorized else None
+        vectorized = array is not None
+        if vectorized:
+            values = array
+
+    if count == 0:
+        stats = {
+            'sum': 0,
+            'count': 0,
+            'average': 0,
+            'min': None,
+            'max': None,
+            'variance': None,
+            'std': None
+        }
+        for p in percentiles:
+            stats[f'p{p}'] = None
+        return stats
+
+    if vectorized:
+        lowest, highest = values.min().item(), values.max().item()
+        total_sum = values.sum().item()
+        if values.dtype.kind == 'i' and max(-lowest, highest) * count >= 2 ** 63:
+            # Сума int64 переповнюється мовчки; у сумнівному разі рахуємо точно
+            total_sum = sum(values.tolist())
+        average = total_sum / count
+        variance = values.var().item()
+        stats = {
+            'sum': total_sum,
+            'count': count,
+            'average': average,
+            'min': lowest,
+            'max': highest,
+            'variance': variance,
+            'std': math.sqrt(variance)
+        }
+        if percentiles and values.dtype.kind == 'i':
+            # Інтерполяція на цілих Python, як у _percentile_of_sorted:
+            # точні значення замість float64 з np.quantile
+            ordered = np.sort(values)
+            for p in percentiles:
+                position = (count - 1) * p / 100
+                lower = int(position)
+                low = ordered[lower].item()
+                if position == lower:
+                    stats[f'p{p}'] = low
+                else:
+                    stats[f'p{p}'] = low + (ordered[lower + 1].item() - low) * (position - lower)
+        elif percentiles:
+            quantiles = np.quantile(values, [p / 100 for p in percentiles])
+            for p, value in zip(percentiles, quantiles.tolist()):
+                stats[f'p{p}'] = value
+        return stats
+
+    total_sum = sum(values)
+    average = total_sum / count
+    variance = sum((value - average) ** 2 for value in values) / count
+    stats = {
+        'sum': total_sum,
+        'count': count,
+        'average': average,
+        'min': min(values),
+        'max': max(values),
+        'variance': variance,
+        'std': math.sqrt(variance)
+    }
+    if percentiles:
+        values.sort()
+        for p in percentiles:
+            stats[f'p{p}'] = _percentile_of_sorted(values, p)
+    return stats
 
 # Демонстрація роботи
 def main():
@@ -220,9 +383,9 @@ def main():
     # Обчислюємо суму різними способами
     print(f"\n🔍 Результати обчислення суми:")
     
-    # Рекурсивний метод класу
-    sum_recursive = bst.sum_values()
-    print(f"   Рекурсивний метод: {sum_recursive}")
+    # Метод класу
+    sum_method = bst.sum_values()
+    print(f"   Метод класу: {sum_method}")
     
     # Ітеративний підхід
     sum_iterative = sum_tree_iterative(bst.root)
@@ -232,17 +395,23 @@ def main():
     sum_level_order = sum_tree_level_order(bst.root)
     print(f"   Обхід у ширину: {sum_level_order}")
     
+    # Обхід Морріса без стека
+    sum_morris = sum_tree_morris(bst.root)
+    print(f"   Обхід Морріса: {sum_morris}")
+    
     # Додаткова статистика
     node_count = bst.count_nodes()
     average = bst.average_value()
     
     print(f"\n📊 Статистика дерева:")
     print(f"   Кількість вузлів: {node_count}")
-    print(f"   Сума всіх значень: {sum_recursive}")
+    print(f"   Сума всіх значень: {sum_method}")
     print(f"   Середнє значення: {average:.2f}")
+    print(f"   Сума діапазону [10, 20]: {bst.sum_range(10, 20)} ({bst.count_range(10, 20)} вузлів)")
+    print(f"   Медіана: {bst.percentile(50)}, 3-є найменше: {bst.select(2)}, ранг 17: {bst.rank(17)}")
     
     # Комплексна статистика
-    stats = tree_statistics(bst.root)
+    stats = tree_statistics(bst)
     print(f"\n📈 Детальна статистика:")
     for key, value in stats.items():
         if isinstance(value, float):
@@ -289,7 +458,23 @@ def main():
     actual_zero_sum = zero_bst.sum_values()
     print(f"   Числа з нулем {zero_values}: {actual_zero_sum} (очікувано: {expected_zero_sum})")
     
-    print(f"\n✅ Основна сума всіх значень у дереві: {sum_recursive}")
+    # AVL-дерево дає ту саму суму, що й звичайне
+    avl = AVLTree()
+    for val in values:
+        avl.insert(val)
+    print(f"   AVL-дерево {values}: {avl.sum_values()} (очікувано: {sum(values)})")
+    
+    # Пакетне завантаження будує збалансоване дерево за один прохід
+    bulk_bst = BinarySearchTree.from_iterable(range(1, 10001))
+    print(f"   from_iterable(1..10000): {bulk_bst.sum_values()} (очікувано: {sum(range(1, 10001))})")
+    
+    # Мультимножина: повторні значення враховуються в сумі та кількості
+    repeated_values = [5, 5, 5, 10, 10, 20]
+    multiset_bst = BinarySearchTree.from_iterable(repeated_values, multiset=True)
+    print(f"   Мультимножина {repeated_values}: сума {multiset_bst.sum_values()}, "
+          f"кількість {multiset_bst.count_nodes()} (очікувано: {sum(repeated_values)}, {len(repeated_values)})")
+    
+    print(f"\n✅ Основна сума всіх значень у дереві: {sum_method}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,395 @@
+"""
+Двійковий формат дерева на диску та його читання через mmap
+
+Файл складається із заголовка фіксованого розміру та суцільних секцій:
+
+    заголовок (48 байтів)  сигнатура, версія формату, тип ключів, прапорці,
+                           кількість вузлів, індекс кореня, кількість
+                           значень і сума всіх значень
+    ключі      (8n байтів) float64 або int64 у порядку зростання
+    ліві діти  (4n байтів) int32, -1 - дитини немає
+    праві діти (4n байтів) int32
+    кратності  (8n байтів) int64, лише для мультимножини
+
+Вузли нумеруються в порядку in-order, тож секція ключів відсортована, а
+масиви дітей зберігають форму дерева. Усі числа записуються в порядку
+байтів little-endian, секції вирівняні на 8 байтів. Якщо сума цілих
+ключів не вміщається в int64, у заголовку ставиться прапорець, а сума
+рахується заново під час читання.
+
+BinarySearchTree.save/load користуються функціями save_tree та load_tree,
+а MappedTree відкриває файл через mmap і відповідає на запити лише для
+читання (find_max, find_min, діапазони, суми) прямо зі змапованих сторінок,
+не створюючи жодного об'єкта Node.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+
+from bst import BinarySearchTree, _height
+
+MAGIC = b'BST1'
+FORMAT_VERSION = 1
+
+# Сигнатура, версія, тип ключів, прапорці, вирівнювання,
+# кількість вузлів, індекс кореня, кількість значень
+_HEADER = struct.Struct('<4sHcB4xqqq')
+# Сума значень іде окремим полем після вирівнювання: '<d' або '<q' за типом ключів
+_SUM_OFFSET = 40
+HEADER_SIZE = 48
+
+_MULTISET = 0x01
+# Сума цілих ключів не вміщається в int64: поле суми не заповнене
+_SUM_OVERFLOW = 0x02
+_NONE = -1
+
+def _little_endian(buffer):
+    """Масив у порядку байтів файлу (копія лише на big-endian платформах)"""
+    if sys.byteorder == 'big':
+        buffer = array(buffer.typecode, buffer)
+        buffer.byteswap()
+    return buffer
+
+def _key_typecode(keys):
+    """
+    'q', якщо всі ключі цілі, інакше 'd'.
+
+    Raises:
+        ValueError: Якщо цілий ключ не вміщається в int64
+    """
+    typecode = 'q'
+    for key in keys:
+        if not isinstance(key, int):
+            typecode = 'd'
+        elif not -2 ** 63 <= key < 2 ** 63:
+            raise ValueError(f"Цілий ключ {key} не вміщається в int64")
+    return typecode
+
+def save_tree(tree, path):
+    """
+    Записує дерево у двійковий файл одним in-order проходом.
+
+    Args:
+        tree (BinarySearchTree): Дерево з числовими ключами
+        path (str): Шлях до файлу (перезаписується)
+
+    Raises:
+        ValueError: Якщо цілий ключ не вміщається в int64
+    """
+    nodes = list(tree._inorder_nodes())
+    index = {id(node): position for position, node in enumerate(nodes)}
+    count = len(nodes)
+
+    total = tree.sum_values()
+    typecode = _key_typecode(node.key for node in nodes)
+    flags = _MULTISET if tree.multiset else 0
+    if typecode == 'q' and not -2 ** 63 <= total < 2 ** 63:
+        # Ключі лишаються точними, а суму читач порахує сам
+        flags |= _SUM_OVERFLOW
+        total = 0
+    keys = array(typecode, [node.key for node in nodes])
+    left = array('i', [_NONE]) * count
+    right = array('i', [_NONE]) * count
+    for position, node in enumerate(nodes):
+        if node.left is not None:
+            left[position] = index[id(node.left)]
+        if node.right is not None:
+            right[position] = index[id(node.right)]
+
+    root = index[id(tree.root)] if tree.root is not None else _NONE
+    header = bytearray(HEADER_SIZE)
+    _HEADER.pack_into(header, 0, MAGIC, FORMAT_VERSION, typecode.encode(), flags,
+                      count, root, tree.count_nodes())
+    struct.pack_into('<' + typecode, header, _SUM_OFFSET, total if typecode == 'q' else float(total))
+
+    with open(path, 'wb') as file:
+        file.write(header)
+        for section in (keys, left, right):
+            _little_endian(section).tofile(file)
+        if tree.multiset:
+            _little_endian(array('q', [node.count for node in nodes])).tofile(file)
+
+def _read_header(buffer):
+    """
+    Розбирає та перевіряє заголовок.
+
+    Returns:
+        tuple: (тип ключів, мультимножина, кількість вузлів, корінь, кількість
+            значень, сума або None, якщо її треба порахувати за ключами)
+
+    Raises:
+        ValueError: Якщо файл не є деревом у підтримуваному форматі
+    """
+    if len(buffer) < HEADER_SIZE:
+        raise ValueError("Файл занадто короткий для дерева")
+
+    magic, version, typecode, flags, count, root, values = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Файл не містить дерева (неправильна сигнатура)")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Непідтримувана версія формату: {version}")
+
+    typecode = typecode.decode()
+    if typecode not in ('d', 'q'):
+        raise ValueError(f"Непідтримуваний тип ключів: {typecode!r}")
+
+    multiset = bool(flags & _MULTISET)
+    expected = HEADER_SIZE + count * (24 if multiset else 16)
+    if len(buffer) < expected:
+        raise ValueError("Файл обрізаний: секції вузлів неповні")
+
+    total = None
+    if not flags & _SUM_OVERFLOW:
+        (total,) = struct.unpack_from('<' + typecode, buffer, _SUM_OFFSET)
+    return typecode, multiset, count, root, values, total
+
+def _section(buffer, typecode, offset, count):
+    """Масив секції, прочитаний з буфера (з виправленням порядку байтів)"""
+    section = array(typecode)
+    section.frombytes(buffer[offset:offset + count * section.itemsize])
+    if sys.byteorder == 'big':
+        section.byteswap()
+    return section
+
+def load_tree(cls, path, **options):
+    """
+    Відновлює дерево з файлу за O(n) без жодного порівняння ключів.
+
+    Вузли створюються відразу з відсортованої секції ключів і зв'язуються
+    за збереженими масивами дітей, тож форма дерева зберігається. Якщо
+    клас сам підтримує баланс (наприклад, AVLTree), а збережена форма
+    незбалансована, або вузли класу мають власні поля (колір, пріоритет),
+    дерево будується заново через _build.
+
+    Args:
+        cls (type): BinarySearchTree або його підклас
+        path (str): Шлях до файлу, записаного save_tree
+        **options: Параметри конструктора; multiset береться з файлу
+
+    Returns:
+        BinarySearchTree: Нове дерево класу cls
+    """
+    with open(path, 'rb') as file:
+        buffer = file.read()
+
+    typecode, multiset, count, root, _, _ = _read_header(buffer)
+    options['multiset'] = multiset
+    tree = cls(**options)
+    if count == 0:
+        return tree
+
+    offset = HEADER_SIZE
+    keys = _section(buffer, typecode, offset, count)
+    offset += count * 8
+    left = _section(buffer, 'i', offset, count)
+    offset += count * 4
+    right = _section(buffer, 'i', offset, count)
+    offset += count * 4
+    counts = _section(buffer, 'q', offset, count) if multiset else None
+
+    nodes = [tree._node_class(key) for key in keys]
+    if counts is not None:
+        for node, multiplicity in zip(nodes, counts):
+            node.count = multiplicity
+
+    # Прямий порядок від кореня: діти обробляються після батьків
+    order = []
+    stack = [root]
+    while stack:
+        position = stack.pop()
+        node = nodes[position]
+        order.append(node)
+        if len(order) > count:
+            raise ValueError("Пошкоджені масиви дітей: цикл у структурі дерева")
+        if left[position] != _NONE:
+            node.left = nodes[left[position]]
+            stack.append(left[position])
+        if right[position] != _NONE:
+            node.right = nodes[right[position]]
+            stack.append(right[position])
+
+    if len(order) != count:
+        raise ValueError("Пошкоджені масиви дітей: не всі вузли досяжні з кореня")
+
+    balanced = True
+    for node in reversed(order):
+        tree._update(node)
+        if abs(_height(node.left) - _height(node.right)) > 1:
+            balanced = False
+
+    # Стратегії з власними полями вузлів (колір, пріоритет) будують форму самі
+    plain = cls._build is BinarySearchTree._build
+    if plain and (balanced or cls._rebalance is BinarySearchTree._rebalance):
+        tree.root = nodes[root]
+    else:
+        tree.root = tree._build(nodes)
+    tree._reset_extremes()
+    return tree
+
+class MappedTree:
+    """
+    Дерево лише для читання, відкрите з файлу через mmap без копіювання.
+
+    Секції ключів і кратностей доступні як memoryview над змапованими
+    сторінками; операційна система підвантажує лише ті сторінки, яких
+    торкаються запити. Оскільки ключі лежать у порядку in-order, пошук і
+    межі діапазонів шукаються бінарним пошуком по секції ключів, що
+    еквівалентно спуску по збережених масивах дітей, але торкається
+    меншої кількості сторінок.
+
+    Використання:
+        with MappedTree.open('tree.bin') as tree:
+            tree.find_max(), tree.sum_range(10, 20)
+    """
+
+    def __init__(self, file, mapping):
+        self._file = file
+        self._mmap = mapping
+        header = _read_header(mapping)
+        typecode, self.multiset, count, _, self._values, self._total = header
+
+        view = memoryview(mapping)
+        self._view = view
+        offset = HEADER_SIZE
+        self._keys = view[offset:offset + count * 8].cast(typecode)
+        offset += count * 16
+        self._counts = view[offset:offset + count * 8].cast('q') if self.multiset else None
+
+    @classmethod
+    def open(cls, path):
+        """
+        Відкриває файл, записаний save_tree, для читання через mmap.
+
+        Raises:
+            ValueError: Якщо файл пошкоджений або платформа big-endian
+                (секції не можна читати без перетворення порядку байтів)
+        """
+        if sys.byteorder == 'big':
+            raise ValueError("MappedTree потребує little-endian платформи; використайте load_tree")
+
+        file = open(path, 'rb')
+        try:
+            if file.seek(0, 2) == 0:
+                raise ValueError("Файл порожній")
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return cls(file, mapping)
+            except BaseException:
+                mapping.close()
+                raise
+        except BaseException:
+            file.close()
+            raise
+
+    def close(self):
+        """Звільняє представлення пам'яті, mmap та файл"""
+        if self._mmap is None:
+            return
+        if self._counts is not None:
+            self._counts.release()
+        self._keys.release()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._values
+
+    def find_max(self):
+        """Найбільше значення (останній ключ секції) або None"""
+        return self._keys[-1] if len(self._keys) else None
+
+    def find_min(self):
+        """Найменше значення (перший ключ секції) або None"""
+        return self._keys[0] if len(self._keys) else None
+
+    def sum_values(self):
+        """
+        Сума всіх значень із заголовка за O(1).
+
+        Якщо сума не вмістилася в заголовок, вона рахується за секцією
+        ключів під час першого виклику.
+        """
+        if self._total is None:
+            self._total = self.sum_range(None, None)
+        return self._total
+
+    def count_nodes(self):
+        """Кількість значень (з урахуванням кратності) із заголовка за O(1)"""
+        return self._values
+
+    def average_value(self):
+        """Середнє арифметичне значення або 0 для порожнього дерева"""
+        if self._values == 0:
+            return 0
+        return self.sum_values() / self._values
+
+    def contains(self, key):
+        """Перевіряє, чи є ключ у дереві, бінарним пошуком за O(log n)"""
+        position = bisect_left(self._keys, key)
+        return position < len(self._keys) and self._keys[position] == key
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def _bounds(self, lo, hi):
+        """Напіввідкритий діапазон позицій ключів з [lo, hi] (None - без межі)"""
+        start = 0 if lo is None else bisect_left(self._keys, lo)
+        stop = len(self._keys) if hi is None else bisect_right(self._keys, hi)
+        return start, max(start, stop)
+
+    def sum_range(self, lo, hi):
+        """
+        Сума ключів з діапазону [lo, hi].
+
+        Межі шукаються за O(log n), а сума рахується одним проходом
+        по суцільному зрізу змапованої секції.
+        """
+        start, stop = self._bounds(lo, hi)
+        with self._keys[start:stop] as keys:
+            if self._counts is None:
+                return sum(keys)
+            with self._counts[start:stop] as counts:
+                return sum(key * count for key, count in zip(keys, counts))
+
+    def count_range(self, lo, hi):
+        """Кількість ключів з діапазону [lo, hi]"""
+        start, stop = self._bounds(lo, hi)
+        if self._counts is None:
+            return stop - start
+        with self._counts[start:stop] as counts:
+            return sum(counts)
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Ліниво видає значення з діапазону [lo, hi] у порядку зростання
+        (або спадання при reverse=True) прямо зі змапованої секції.
+        """
+        start, stop = self._bounds(lo, hi)
+        positions = range(stop - 1, start - 1, -1) if reverse else range(start, stop)
+        keys, counts = self._keys, self._counts
+        for position in positions:
+            if counts is None:
+                yield keys[position]
+            else:
+                yield from repeat(keys[position], counts[position])
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def display_inorder(self):
+        """Значення в порядку зростання"""
+        if self._counts is None:
+            return self._keys.tolist()
+        return list(self)